@@ -0,0 +1,122 @@
+import os
+import sys
+import glob
+import json
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from argparse import ArgumentParser
+
+import matdasm
+from instructions import InstrType
+from decode import warmBackend
+
+def collectInputs(patterns, manifest = None):
+   # globs from the command line plus one path or glob per manifest line
+   if manifest is not None:
+      with open(manifest) as file:
+         for line in file:
+            line = line.strip()
+            if line and not line.startswith('#'):
+               patterns.append(line)
+
+   inputs = []
+   seen = set()
+   for pattern in patterns:
+      for path in sorted(glob.glob(pattern, recursive=True)) or [pattern]:
+         if path.endswith('.yml') or path in seen:
+            continue
+         seen.add(path)
+         inputs.append(path)
+   return inputs
+
+def outputPaths(inputs, outdir):
+   # <name>.asm, prefixed with the parent directory when names collide
+   names = {}
+   for path in inputs:
+      names.setdefault(Path(path).name, []).append(path)
+
+   out = {}
+   for name, paths in names.items():
+      for path in paths:
+         if len(paths) > 1:
+            name = f"{Path(path).parent.name}_{Path(path).name}"
+         out[path] = str(Path(outdir) / f"{name}.asm")
+   return out
+
+def disassembleOne(inputPath, output, addresses, binaryops, flow, entry, compiled = False):
+   start = time.perf_counter()
+   result = {
+      'input' : inputPath,
+      'output' : output,
+      'symbols' : str(matdasm.symbolPath(inputPath)) if matdasm.symbolPath(inputPath).is_file() else None,
+   }
+   try:
+      session, image, program = matdasm.disassembleFile(inputPath, output, addresses, binaryops, flow, entry, compiled = compiled)
+      result['bytes'] = len(image)
+      result['instructions'] = len(program)
+      result['data'] = sum(1 for pc in program if program[pc].insType == InstrType.JUNK)
+      result['labels'] = len(session.labels)
+      result['error'] = None
+   except Exception as e:
+      result['error'] = f"{type(e).__name__}: {e}"
+   result['seconds'] = round(time.perf_counter() - start, 4)
+   return result
+
+def runBatch(inputs, outdir, jobs = None, addresses = False, binaryops = False, flow = False, entry = (), compiled = False):
+   os.makedirs(outdir, exist_ok=True)
+   outputs = outputPaths(inputs, outdir)
+   jobs = max(1, min(jobs or os.cpu_count() or 1, len(inputs) or 1))
+
+   results = []
+   with ProcessPoolExecutor(max_workers=jobs, initializer=warmBackend) as pool:
+      futures = [pool.submit(disassembleOne, path, outputs[path], addresses, binaryops, flow, entry, compiled) for path in inputs]
+      for future in as_completed(futures):
+         results.append(future.result())
+
+   results.sort(key=lambda r: r['input'])
+   return results
+
+def main(argv = None):
+   parser = ArgumentParser()
+   parser.add_argument('inputs', nargs='*', help='binary files or globs, a .bin.yml next to each is picked up', type=str)
+   parser.add_argument('-m', '--manifest', help='file listing one input path or glob per line', type=str)
+   parser.add_argument('-d', '--outdir', help='directory for the .asm files and summary.json', default='out', type=str)
+   parser.add_argument('-j', '--jobs', help='worker processes (default: cpu count)', type=int)
+   parser.add_argument('-a', '--addresses', help='show addresses for each line', action="store_true", default=False)
+   parser.add_argument('-w', '--binaryops', help='Show opcodes w/ binary', action="store_true", default=False)
+   parser.add_argument('-f', '--flow', help='follow control flow from the entry points, everything unreached is data', action="store_true", default=False)
+   parser.add_argument('-e', '--entry', help='extra entry point for --flow, may be repeated', action="append", default=[], type=str)
+   parser.add_argument('-c', '--compiled-symbols', help='load symbols through compiled .ymlc sidecars', action="store_true", default=False)
+   args = parser.parse_args(argv)
+
+   inputs = collectInputs(list(args.inputs), args.manifest)
+   if not inputs:
+      parser.error("no inputs")
+
+   start = time.perf_counter()
+   results = runBatch(inputs, args.outdir, args.jobs, args.addresses, args.binaryops, args.flow, args.entry, args.compiled_symbols)
+   elapsed = time.perf_counter() - start
+
+   failed = [r for r in results if r['error']]
+   summary = {
+      'roms' : len(results),
+      'failed' : len(failed),
+      'bytes' : sum(r.get('bytes', 0) for r in results),
+      'seconds' : round(elapsed, 4),
+      'results' : results,
+   }
+   with open(Path(args.outdir) / "summary.json", 'w') as file:
+      json.dump(summary, file, indent=2)
+
+   for r in results:
+      if r['error']:
+         print(f"FAIL {r['input']}: {r['error']}")
+      else:
+         print(f"ok   {r['input']} -> {r['output']} ({r['instructions']} lines, {r['labels']} labels, {r['seconds']}s)")
+   print(f"{len(results)} ROMs, {len(failed)} failed, {elapsed:.2f}s")
+
+   return 1 if failed else 0
+
+if __name__ == '__main__':
+   sys.exit(main())
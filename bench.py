@@ -0,0 +1,650 @@
+import sys
+import time
+from argparse import ArgumentParser
+
+from utils import loadImage
+from instructions import DataMap
+from decode import Program, sweep, linearSweep, flowSweep
+from session import DisassemblySession
+
+def timeit(fn, repeat):
+   best = None
+   for i in range(repeat):
+      start = time.perf_counter()
+      fn()
+      elapsed = time.perf_counter() - start
+      if best is None or elapsed < best:
+         best = elapsed
+   return best
+
+def report(name, elapsed, count, unit):
+   print(f"{name:<32} {elapsed*1000:9.2f} ms {count/elapsed:14.0f} {unit}/s")
+
+# the original front end, one read(1) + int.from_bytes per byte
+def legacyFrontEnd(path, alli):
+   with open(path, mode='rb') as file:
+      while (byte := file.read(1)):
+         instr = alli[int.from_bytes(byte)]
+         if instr.numOperands >= 1:
+            operand1 = int.from_bytes(file.read(1))
+         if instr.numOperands == 2:
+            operand2 = int.from_bytes(file.read(1))
+
+def frontEnd(path):
+   for i in sweep(loadImage(path), DataMap()):
+      pass
+
+def benchFrontEnd(args):
+   from instructions import validateTable
+   alli = validateTable()
+   size = len(loadImage(args.input))
+   report("front end (read(1))", timeit(lambda: legacyFrontEnd(args.input, alli), args.repeat), size, "bytes")
+   report("front end (mmap)", timeit(lambda: frontEnd(args.input), args.repeat), size, "bytes")
+
+# the original per-byte deepcopy of the pydantic template
+def legacyDecode(image, alli):
+   import copy
+   for PC, opcode, operand1, operand2, data in sweep(image, DataMap()):
+      newInstr = copy.deepcopy(alli[opcode])
+
+def decode(image):
+   for i in linearSweep(image, DisassemblySession()):
+      pass
+
+def benchDecode(args):
+   from instructions import validateTable
+   alli = validateTable()
+   image = loadImage(args.input)
+   report("decode (deepcopy template)", timeit(lambda: legacyDecode(image, alli), args.repeat), len(image), "bytes")
+   report("decode (opcode table)", timeit(lambda: decode(image), args.repeat), len(image), "bytes")
+
+# the original list of ranges, re-merged per insert and scanned per lookup
+class LegacyRanges:
+   def __init__(self):
+      self.dataRanges = None
+
+   def add(self, dbRange):
+      ranges = self.dataRanges if self.dataRanges is not None else []
+      ranges.append(dbRange)
+      merged = []
+      for start, end in sorted(ranges):
+         if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+         else:
+            merged.append([start, end])
+      self.dataRanges = [(r[0], r[1]) for r in merged]
+
+   def __contains__(self, check):
+      for r in self.dataRanges:
+         if r[0] <= check and r[1] >= check:
+            return True
+      return False
+
+def syntheticRanges(count, seed = 8085):
+   import random
+   rnd = random.Random(seed)
+   ranges = []
+   for i in range(count):
+      start = rnd.randrange(0x10000 - 16)
+      ranges.append((start, start + rnd.randrange(1, 16)))
+   return ranges
+
+def benchDataRanges(args):
+   ranges = syntheticRanges(args.ranges)
+   probes = range(0, 0x10000, 7)
+
+   def legacy():
+      r = LegacyRanges()
+      for i in ranges:
+         r.add(i)
+      for a in probes:
+         a in r
+
+   def bitmap():
+      m = DataMap()
+      m.addMany(ranges)
+      for a in probes:
+         a in m
+
+   report(f"data ranges (list, {len(ranges)})", timeit(legacy, 1), len(probes), "lookups")
+   report(f"data ranges (bitmap, {len(ranges)})", timeit(bitmap, args.repeat), len(probes), "lookups")
+
+# the original parser, up to four re.match calls and a re.sub per value
+def legacyHexParse(word):
+   import re
+   if re.match(r'^(0X|0x)[0-9a-fA-F]+$', word):
+      return int(word, 16)
+   elif re.match(r'^(#)[0-9a-fA-F]+$', word):
+      word = re.sub(r'(#)', '', word)
+      return int(f"0x{word}", 16)
+   elif re.match(r'^(\$)[0-9a-fA-F]+$', word):
+      word = re.sub(r'(\$)', '', word)
+      return int(f"0x{word}", 16)
+   elif(re.match(r'^([0-9a-fA-F]+(H|h))$', word)):
+      word = re.sub(r'(H|h)', '', word)
+      return int(f"0x{word}", 16)
+   return None
+
+def benchHexParse(args):
+   from utils import hexParse
+   forms = ("0x{:04x}", "#{:04x}", "${:04X}", "{:04x}h")
+   words = [forms[i % 4].format(i * 7 & 0xffff) for i in range(args.ranges * 10)]
+   assert [legacyHexParse(w) for w in words] == [hexParse(w) for w in words]
+
+   for form in forms:
+      sample = [form.format(i) for i in range(0, 0x10000, 16)]
+      name = form.format(0).replace('0000', 'nn')
+      report(f"hexParse {name} (re.match chain)", timeit(lambda: [legacyHexParse(w) for w in sample], args.repeat), len(sample), "values")
+      report(f"hexParse {name} (compiled)", timeit(lambda: [hexParse(w) for w in sample], args.repeat), len(sample), "values")
+   report("hexParse mixed (re.match chain)", timeit(lambda: [legacyHexParse(w) for w in words], args.repeat), len(words), "values")
+   report("hexParse mixed (compiled)", timeit(lambda: [hexParse(w) for w in words], args.repeat), len(words), "values")
+
+def tiledImage(path, size):
+   # repeat a real ROM up to size bytes, the branch targets stay plausible
+   rom = bytes(loadImage(path))
+   return memoryview((rom * (size // len(rom) + 1))[:size])
+
+def benchFlow(args):
+   image = tiledImage(args.input, args.size)
+   report(f"linear sweep ({len(image)} bytes)", timeit(lambda: decode(image), args.repeat), len(image), "bytes")
+   report(f"flow decode ({len(image)} bytes)", timeit(lambda: [i for i in flowSweep(image, DisassemblySession())], args.repeat), len(image), "bytes")
+
+def tracedMemory(fn):
+   # (bytes still held when fn returns, peak bytes while it ran, its result)
+   import tracemalloc
+   tracemalloc.start()
+   result = fn()
+   current, peak = tracemalloc.get_traced_memory()
+   tracemalloc.stop()
+   return current, peak, result
+
+def benchProgram(args):
+   from collections import OrderedDict
+   from pydantic import BaseModel
+
+   # the original pydantic Address keys
+   class Address(BaseModel):
+      address : int
+
+      def __hash__(self):
+         return self.address
+
+   image = tiledImage(args.input, args.size)
+   decoded = list(linearSweep(image, DisassemblySession()))
+   targets = [i.targetAddress for PC, i in decoded if i.targetAddress is not None]
+
+   def legacy():
+      program = OrderedDict()
+      for PC, instance in decoded:
+         program[Address(address = PC)] = instance
+      return program
+
+   def dense():
+      program = Program(len(image))
+      for PC, instance in decoded:
+         program.add(PC, instance)
+      return program
+
+   for name, build, key in (("OrderedDict[Address]", legacy, lambda a: Address(address = a)), ("Program", dense, lambda a: a)):
+      size, peak, program = tracedMemory(build)
+      print(f"program store {name:<22} {size/1024:9.1f} KiB held, {peak/1024:9.1f} KiB peak for {len(decoded)} instructions")
+      report(f"  build", timeit(build, args.repeat), len(decoded), "instrs")
+      report(f"  target lookups", timeit(lambda: [key(t) in program for t in targets], args.repeat), len(targets), "lookups")
+      report(f"  ordered walk", timeit(lambda: [program[a] for a in program], args.repeat), len(decoded), "instrs")
+
+def linkedProgram(image, session):
+   program = session.decode(image)
+   session.link(program)
+   return program
+
+def benchRender(args):
+   import os
+   from emitter import Emitter
+
+   session = DisassemblySession()
+   program = linkedProgram(tiledImage(args.input, args.size), session)
+
+   def printed(addresses):
+      with open(os.devnull, 'w') as file:
+         for pc in program:
+            l = program[pc]
+            if addresses:
+               print(f"{session.addrStr(pc)} {l}", file=file)
+            else:
+               print(f"{l}", file=file)
+
+   def emitted(addresses):
+      with Emitter(os.devnull) as out:
+         out.program(program, session)
+
+   for flag, addresses, binary in (("-a", True, False), ("-w", False, True)):
+      session.addresses = addresses
+      session.binaryops = binary
+      report(f"render {flag} (print)", timeit(lambda: printed(addresses), args.repeat), len(program), "lines")
+      report(f"render {flag} (emitter)", timeit(lambda: emitted(addresses), args.repeat), len(program), "lines")
+
+def benchIncremental(args):
+   import copy
+   from incremental import IncrementalDisassembler
+
+   image = tiledImage(args.input, args.size)
+   base = {'labels' : {}, 'not_code' : {}}
+   start = time.perf_counter()
+   inc = IncrementalDisassembler(image, base, addresses = True)
+   report(f"full build ({len(image)} bytes)", time.perf_counter() - start, len(inc.program), "lines")
+
+   edits = (
+      ("rename label", lambda y: y['labels'].update(MAIN = '$0040')),
+      ("add symbol", lambda y: y.setdefault('addresses', {}).update(CREDITS = '$237a')),
+      ("add not_code", lambda y: y['not_code'].update(table = ['$1000', '$1010'])),
+      ("remove not_code", lambda y: y['not_code'].pop('table')),
+   )
+   symbols = base
+   for name, edit in edits:
+      symbols = copy.deepcopy(symbols)
+      edit(symbols)
+      stats = inc.update(symbols)
+      report(f"  {name} ({stats['mode']}, {stats['lines']} lines)", stats['seconds'], 1, "updates")
+
+def benchStartup(args):
+   import os
+   import subprocess
+
+   here = os.path.dirname(os.path.abspath(__file__))
+
+   def run(argv):
+      return lambda: subprocess.run([sys.executable] + argv, cwd=here, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+   report("startup: python -c pass", timeit(run(['-c', 'pass']), args.repeat), 1, "runs")
+   report("startup: import matdasm", timeit(run(['-c', 'import matdasm']), args.repeat), 1, "runs")
+   report("startup: full run", timeit(run(['matdasm.py', '-i', args.input, '-o', os.devnull]), args.repeat), 1, "runs")
+
+   # the slowest modules by cumulative import time
+   result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import matdasm'], cwd=here, capture_output=True, text=True)
+   rows = []
+   for line in result.stderr.splitlines():
+      parts = line.split('|')
+      if len(parts) == 3 and parts[1].strip().isdigit():
+         rows.append((int(parts[1]), parts[2].rstrip()))
+   for usec, name in sorted(rows, reverse=True)[:8]:
+      print(f"  importtime {usec/1000:8.2f} ms {name}")
+
+phases = ('load', 'symbols', 'decode', 'link', 'render', 'write')
+
+def runPhases(imagePath, symPath, outPath, flow = False, memory = False):
+   # one full disassembly, timed (or traced) phase by phase
+   import io
+   import tracemalloc
+   from emitter import Emitter
+
+   times = {}
+   peaks = {}
+   state = {}
+
+   def load():
+      state['image'] = loadImage(imagePath)
+   def symbols():
+      state['session'] = DisassemblySession(addresses = True, flow = flow)
+      state['session'].loadSymbols(symPath)
+   def decode():
+      state['program'] = state['session'].decode(state['image'])
+   def link():
+      state['session'].link(state['program'])
+   def render():
+      state['text'] = io.StringIO()
+      with Emitter(state['text']) as out:
+         state['session'].render(state['program'], out)
+   def write():
+      with open(outPath, 'w') as file:
+         file.write(state['text'].getvalue())
+
+   if memory:
+      tracemalloc.start()
+   for name, fn in zip(phases, (load, symbols, decode, link, render, write)):
+      if memory:
+         tracemalloc.reset_peak()
+      start = time.perf_counter()
+      fn()
+      times[name] = time.perf_counter() - start
+      if memory:
+         peaks[name] = tracemalloc.get_traced_memory()[1]
+   if memory:
+      tracemalloc.stop()
+   return times, peaks, len(state['image']), len(state['program'])
+
+def writeScenario(directory, name, image, symbols):
+   import os
+   import yaml
+   imagePath = os.path.join(directory, f"{name}.bin")
+   with open(imagePath, 'wb') as file:
+      file.write(image)
+   with open(f"{imagePath}.yml", 'w') as file:
+      yaml.safe_dump(symbols, file)
+   return imagePath
+
+def benchSymbols(args):
+   # a large annotated symbol file through each loader, ending in a full session
+   import os
+   import yaml
+   import tempfile
+   import symfile
+   from synth import annotated
+   image, symbols = annotated(args.size, count = args.ranges)
+   symbols['not_code'] = {f"r{i}" : [f"${s:04x}", f"${e:04x}"] for i, (s, e) in enumerate(syntheticRanges(args.ranges))}
+   count = sum(len(v) for v in symbols.values())
+
+   with tempfile.TemporaryDirectory() as directory:
+      symPath = f"{writeScenario(directory, 'symbols', image, symbols)}.yml"
+
+      def pure():
+         with open(symPath) as file:
+            DisassemblySession().applySymbols(yaml.load(file, Loader=yaml.SafeLoader))
+      def libyaml():
+         DisassemblySession().loadSymbols(symPath)
+      def compiled():
+         DisassemblySession().loadSymbols(symPath, compiled = True)
+
+      compiled()
+      report(f"symbols safe_load ({count})", timeit(pure, args.repeat), count, "entries")
+      report(f"symbols {symfile.yamlLoader().__name__} ({count})", timeit(libyaml, args.repeat), count, "entries")
+      report(f"symbols compiled .ymlc ({count})", timeit(compiled, args.repeat), count, "entries")
+
+def benchNumpy(args):
+   # the linear sweep and label pass, plain Python against the numpy backend
+   try:
+      import fast
+   except ImportError:
+      print("numpy backend: numpy is not installed")
+      return
+   from decode import linkLabels
+   from xref import XrefIndex
+   from synth import generators
+
+   def pureDecode(image, session):
+      program = Program(len(image))
+      for PC, instance in linearSweep(image, session):
+         program.add(PC, instance)
+      return program
+
+   def pureLink(image, session):
+      program = pureDecode(image, session)
+      linkLabels(program, session, XrefIndex(session))
+
+   def fastLink(image, session):
+      program = fast.decodeProgram(image, session)
+      fast.linkProgram(program, session, XrefIndex(session))
+
+   for name in ('dense', 'branchy', 'data'):
+      image, symbols = generators[name](args.size)
+      image = memoryview(image)
+      session = DisassemblySession()
+      session.applySymbols(symbols)
+      assert list(pureDecode(image, session)) == list(fast.decodeProgram(image, session))
+      code = fast.asArray(image)
+      report(f"{name} instruction starts (numpy)", timeit(lambda: fast.instructionStarts(code, session.dataMap.bits), args.repeat), len(image), "bytes")
+      report(f"{name} decode (python)", timeit(lambda: pureDecode(image, session), args.repeat), len(image), "bytes")
+      report(f"{name} decode (numpy)", timeit(lambda: fast.decodeProgram(image, session), args.repeat), len(image), "bytes")
+      report(f"{name} decode + link (python)", timeit(lambda: pureLink(image, DisassemblySession()), args.repeat), len(image), "bytes")
+      report(f"{name} decode + link (numpy)", timeit(lambda: fastLink(image, DisassemblySession()), args.repeat), len(image), "bytes")
+
+def benchParallel(args):
+   # start finding split over worker processes, 1 .. cpu count, against one process
+   import os
+   import parallel
+   from decode import packProgram
+   image = tiledImage(args.input, args.size)
+   session = DisassemblySession()
+
+   def sequential():
+      program = Program(len(image))
+      for PC, instance in linearSweep(image, session):
+         program.add(PC, instance)
+      return packProgram(program, len(image))
+
+   def inProcess():
+      bits = bytes(session.dataMap.bits[:len(image)]).ljust(len(image), b'\0')
+      return parallel.sweepRun(image, bits, 0, len(image), len(image))
+
+   expected = sequential()
+   report(f"sequential decode ({len(image)} bytes)", timeit(sequential, args.repeat), len(image), "bytes")
+   report("sequential sweep, no instances", timeit(inProcess, args.repeat), len(image), "bytes")
+   jobs = 1
+   while True:
+      assert parallel.parallelKinds(image, session.dataMap, jobs) == expected
+      report(f"parallel sweep, {jobs} workers", timeit(lambda: parallel.parallelKinds(image, session.dataMap, jobs), args.repeat), len(image), "bytes")
+      if jobs >= (os.cpu_count() or 1):
+         break
+      jobs = min(jobs * 2, os.cpu_count() or 1)
+   report("parallel decode into a Program", timeit(lambda: parallel.parallelDecode(image, session, jobs), args.repeat), len(image), "bytes")
+
+def benchResolve(args):
+   # one constant propagation scan, and the full resolve loop, over a tiled ROM
+   from resolve import scan, resolveIndirect
+   image = tiledImage(args.input, args.size)
+   session = DisassemblySession()
+   program = session.decode(image)
+   report(f"resolve scan ({len(program)} lines)", timeit(lambda: scan(program, image, session), args.repeat), len(program), "lines")
+
+   def resolveAll():
+      fresh = DisassemblySession()
+      resolveIndirect(fresh.decode(image), image, fresh)
+   report("decode + resolve until stable", timeit(resolveAll, args.repeat), len(image), "bytes")
+
+def benchCfg(args):
+   # blocks, edges, function ownership and a json export on a branch heavy image
+   import io
+   import synth
+   from cfg import ControlFlowGraph
+   image, symbols = synth.branchHeavy(args.size)
+   session = DisassemblySession()
+   program = linkedProgram(image, session)
+   graph = ControlFlowGraph(program, session)
+   report(f"cfg build ({len(graph)} blocks, {len(graph.targets)} edges)", timeit(lambda: ControlFlowGraph(program, session), args.repeat), len(graph), "blocks")
+   report(f"functions ({len(graph.functionEntries())})", timeit(graph.functions, args.repeat), len(graph), "blocks")
+   report("dead code", timeit(graph.deadBlocks, args.repeat), len(graph), "blocks")
+   report("json export", timeit(lambda: graph.toJSON(io.StringIO()), args.repeat), len(graph), "blocks")
+
+def benchCycles(args):
+   # T-state bounds on a branch heavy image, with and without the cfg underneath
+   import synth
+   from cfg import ControlFlowGraph
+   from cycles import CycleCounts
+   image, symbols = synth.branchHeavy(args.size)
+   session = DisassemblySession()
+   program = linkedProgram(image, session)
+   graph = ControlFlowGraph(program, session)
+   counts = CycleCounts(program, session, graph)
+   report(f"cycle bounds ({len(counts.bounds)} subroutines, {len(counts.loops)} loops)", timeit(lambda: CycleCounts(program, session, graph), args.repeat), len(graph), "blocks")
+   report("listing annotations", timeit(counts.annotations, args.repeat), len(program), "lines")
+   report("cfg + bounds + annotations", timeit(lambda: CycleCounts(program, session).annotations(), args.repeat), len(program), "lines")
+
+# known sequences for the emulator: (name, code at $0000, T-states to run,
+# interrupts, expected registers / flags / memory / T-states). F is compared
+# on S Z AC P CY only; T-states is the whole run, HLT included
+emulatorCases = (
+   ("ADI carry and half carry", b'\x3e\x8f\xc6\x81\x76', 100, (),
+    {'A' : 0x10, 'F' : 0x11, 'T-states' : 19}),
+   ("CPI borrow", b'\x3e\x05\xfe\x06\x76', 100, (),
+    {'A' : 0x05, 'F' : 0x95, 'T-states' : 19}),
+   ("DAA", b'\x3e\x38\xc6\x45\x27\x76', 100, (),
+    {'A' : 0x83, 'F' : 0x90, 'T-states' : 23}),
+   ("DAA carry out", b'\x3e\x99\xc6\x01\x27\x76', 100, (),
+    {'A' : 0x00, 'F' : 0x55, 'T-states' : 23}),
+   ("JNZ taken / not taken", b'\x06\x03\x05\xc2\x02\x00\x76', 100, (),
+    {'B' : 0x00, 'T-states' : 7 + 3 * 4 + 10 + 10 + 7 + 5}),
+   ("CZ / RNZ / RZ", b'\x31\x00\x80\xaf\xcc\x08\x00\x76\xc0\xc8', 100, (),
+    {'SP' : 0x8000, 'T-states' : 10 + 4 + 18 + 6 + 12 + 5}),
+   ("SIM then RIM", b'\x3e\x0b\x30\xfb\x20\x76', 100, (),
+    {'A' : 0x0b, 'T-states' : 7 + 4 + 4 + 4 + 5}),
+   # LXI SP; EI; HLT; INR B; JMP $0004, the RST 5.5 handler at $2c: MVI A,42; EI; RET
+   ("RST 5.5 wakes HLT", b'\x31\x00\x80\xfb\x76\x04\xc3\x04\x00' + bytes(0x23) + b'\x3e\x42\xfb\xc9', 950, ((0x2c, 100),),
+    {'A' : 0x42, 'B' : 9, 'SP' : 0x8000}),
+   # the same with RST 5.5 masked by SIM first: asleep for good
+   ("SIM masks RST 5.5", b'\x31\x00\x80\x3e\x09\x30\xfb\x76\x04\xc3\x04\x00' + bytes(0x20) + b'\x3e\x42\xfb\xc9', 1000, ((0x2c, 100),),
+    {'A' : 0x09, 'B' : 0}),
+   # MVI A,3A; STA $fffe; JMP $fffe: LDA $3e00, its high byte wrapping round
+   # to $0000, then on at $0001
+   ("operands wrap at $ffff", b'\x3e\x3a\x32\xfe\xff\xc3\xfe\xff', 7 + 13 + 10 + 13, (),
+    {'A' : 0x00, 'PC' : 0x0001, 'T-states' : 43}),
+   # SP = 2, an interrupt's return address would land on ROM at $0000 / $0001
+   ("interrupt push skips ROM", b'\x31\x02\x00\xfb\xc3\x04\x00' + bytes(0x25) + b'\xc3\x04\x00', 200, ((0x2c, 50),),
+    {'SP' : 0x0000, 'mem' : {0x0000 : 0x31, 0x0001 : 0x02, 0x10000 : 0x31, 0x10001 : 0x02}}),
+)
+
+def checkEmulator():
+   import emulate
+   from emulate import Emulator
+   flags = emulate.S | emulate.Z | emulate.AC | emulate.P | emulate.CY
+   for name, code, cycles, interrupts, expected in emulatorCases:
+      emulator = Emulator(code)
+      emulator.run(cycles, interrupts)
+      got = {}
+      for key, value in expected.items():
+         if key == 'T-states':
+            got[key] = emulator.total()
+         elif key == 'PC':
+            got[key] = emulator.PC
+         elif key == 'mem':
+            got[key] = {address : emulator.mem[address] for address in value}
+         elif key == 'F':
+            got[key] = emulator.R[emulate.F] & flags
+         else:
+            got[key] = emulator.R[getattr(emulate, key)]
+      assert got == expected, f"{name}: {got} != {expected}"
+   try:
+      Emulator(b'\x76').run(100, ((0x2c, 0),))
+   except ValueError:
+      pass
+   else:
+      assert False, "a zero interrupt period was accepted"
+
+def benchEmulate(args):
+   # the ROM run for a fixed number of T-states, once left alone and once
+   # with an RST 5.5 every 20000 T-states, counted in executed instructions
+   from emulate import Emulator
+   checkEmulator()
+   image = loadImage(args.input)
+   for name, interrupts in (("emulate", ()), ("emulate + RST 5.5", ((0x2c, 20000),))):
+      counts = []
+      def run():
+         emulator = Emulator(image)
+         emulator.run(4_000_000, interrupts)
+         counts.append(sum(emulator.hits))
+      elapsed = timeit(run, args.repeat)
+      report(f"{name} ({counts[-1]} instructions)", elapsed, counts[-1], "instructions")
+
+def benchDiff(args):
+   # two revisions of a tiled ROM, the second with a few bytes inserted half way
+   import os
+   import tempfile
+   import diff
+   image = bytes(tiledImage(args.input, args.size))
+   revised = image[:len(image) // 2] + b'\x00\x00\x00' + image[len(image) // 2:-3]
+   with tempfile.TemporaryDirectory() as directory:
+      paths = []
+      for name, data in (('old.bin', image), ('new.bin', revised)):
+         paths.append(os.path.join(directory, name))
+         with open(paths[-1], 'wb') as file:
+            file.write(data)
+      report("byte alignment", timeit(lambda: diff.Alignment(image, revised), args.repeat), len(image), "bytes")
+      result = diff.compare(*paths)
+      report(f"diff ({len(result['hunks'])} hunks, {result['relocated']} relocation only)", timeit(lambda: diff.compare(*paths), args.repeat), len(image), "bytes")
+
+def benchSuite(args):
+   import json
+   import tempfile
+   import synth
+
+   scenarios = {name : [gen(args.size)] for name, gen in synth.generators.items()}
+   scenarios['banks'] = synth.banks(4, max(args.size // 4, 0x400))
+
+   results = {}
+   with tempfile.TemporaryDirectory() as directory:
+      for name, images in scenarios.items():
+         best = None
+         peaks = {}
+         size = lines = 0
+         paths = [writeScenario(directory, f"{name}{i}", image, symbols) for i, (image, symbols) in enumerate(images)]
+         for r in range(args.repeat):
+            times = dict.fromkeys(phases, 0.0)
+            size = lines = 0
+            for path in paths:
+               t, p, n, l = runPhases(path, f"{path}.yml", f"{path}.asm", args.flow)
+               for phase in phases:
+                  times[phase] = times[phase] + t[phase]
+               size = size + n
+               lines = lines + l
+            if best is None or sum(times.values()) < sum(best.values()):
+               best = times
+         for path in paths:
+            t, p, n, l = runPhases(path, f"{path}.yml", f"{path}.asm", args.flow, memory = True)
+            for phase in phases:
+               peaks[phase] = max(peaks.get(phase, 0), p[phase])
+
+         total = sum(best.values())
+         results[name] = {phase : round(best[phase] * 1000, 3) for phase in phases}
+         results[name]['total'] = round(total * 1000, 3)
+         results[name]['peakKiB'] = round(max(peaks.values()) / 1024, 1)
+
+         print(f"{name:<10} {size:7d} bytes {lines:7d} lines {total*1000:9.2f} ms {size/total:12.0f} bytes/s {lines/total:10.0f} lines/s  peak {results[name]['peakKiB']:9.1f} KiB")
+         print("           " + "  ".join(f"{phase} {best[phase]*1000:.2f}" for phase in phases))
+
+   if args.save_baseline:
+      with open(args.save_baseline, 'w') as file:
+         json.dump(results, file, indent=1)
+      print(f"baseline written to {args.save_baseline}")
+
+   if args.baseline:
+      with open(args.baseline) as file:
+         baseline = json.load(file)
+      regressions = []
+      for name, metrics in results.items():
+         for metric, value in metrics.items():
+            old = baseline.get(name, {}).get(metric)
+            # ignore sub-millisecond phases, they're all noise
+            if old and value > old * args.tolerance and value - old > 1.0:
+               regressions.append(f"REGRESSION {name}.{metric}: {old} -> {value}")
+      for line in regressions:
+         print(line)
+      if regressions:
+         sys.exit(1)
+      print(f"no regressions against {args.baseline} (tolerance {args.tolerance}x)")
+
+benches = {
+   'frontend' : benchFrontEnd,
+   'decode' : benchDecode,
+   'dataranges' : benchDataRanges,
+   'hexparse' : benchHexParse,
+   'symbols' : benchSymbols,
+   'numpy' : benchNumpy,
+   'parallel' : benchParallel,
+   'resolve' : benchResolve,
+   'cfg' : benchCfg,
+   'diff' : benchDiff,
+   'cycles' : benchCycles,
+   'emulate' : benchEmulate,
+   'flow' : benchFlow,
+   'program' : benchProgram,
+   'render' : benchRender,
+   'incremental' : benchIncremental,
+   'startup' : benchStartup,
+   'suite' : benchSuite,
+}
+
+if __name__ == '__main__':
+   parser = ArgumentParser()
+   parser.add_argument('-i', '--input', help='Input binary file', default='samples/pentacp2.bin', type=str)
+   parser.add_argument('-r', '--repeat', help='best of N runs', default=5, type=int)
+   parser.add_argument('--size', help='image size for the synthetic benchmarks', default=0x10000, type=int)
+   parser.add_argument('--ranges', help='not_code ranges for the dataranges benchmark', default=2000, type=int)
+   parser.add_argument('-f', '--flow', help='use flow decoding in the suite', action="store_true", default=False)
+   parser.add_argument('--save-baseline', help='write suite results to this json file', type=str)
+   parser.add_argument('--baseline', help='compare suite results against this json file, exit 1 on regressions', type=str)
+   parser.add_argument('--tolerance', help='allowed slowdown factor against the baseline', default=1.3, type=float)
+   parser.add_argument('bench', nargs='*', help=f"benchmarks to run: {', '.join(benches)}")
+   args = parser.parse_args()
+
+   for name in (args.bench or benches):
+      if name not in benches:
+         sys.exit(f"unknown benchmark {name}")
+      benches[name](args)
@@ -0,0 +1,86 @@
+import os
+import json
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+
+# bump when the decoder or the listing format changes so old entries miss
+cacheVersion = 1
+
+def defaultCacheDir():
+   base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+   return os.environ.get('MATDASM_CACHE', os.path.join(base, 'matdasm'))
+
+def digest(*parts):
+   h = hashlib.sha256()
+   for part in parts:
+      if not isinstance(part, (bytes, bytearray, memoryview)):
+         part = json.dumps(part, sort_keys=True, default=str).encode()
+      h.update(len(part).to_bytes(8, 'little'))
+      h.update(part)
+   return h.hexdigest()
+
+# content addressed files under one directory, least recently used go first
+class Cache:
+   def __init__(self, path = None, maxBytes = 256 << 20):
+      self.path = Path(path or defaultCacheDir())
+      self.path.mkdir(parents=True, exist_ok=True)
+      self.maxBytes = maxBytes
+
+   def file(self, kind, key):
+      return self.path / f"{kind}-{key}"
+
+   def get(self, kind, key):
+      path = self.file(kind, key)
+      try:
+         with open(path, 'rb') as file:
+            data = file.read()
+      except OSError:
+         return None
+      # mtime doubles as the last use time for eviction
+      try:
+         os.utime(path)
+      except OSError:
+         # evicted by another process since the read, the data is still good
+         pass
+      return data
+
+   def put(self, kind, key, data):
+      fd, tmp = tempfile.mkstemp(dir=self.path, prefix='.tmp-')
+      with os.fdopen(fd, 'wb') as file:
+         file.write(data)
+      os.replace(tmp, self.file(kind, key))
+      self.evict()
+
+   def getObject(self, kind, key):
+      data = self.get(kind, key)
+      if data is None:
+         return None
+      try:
+         version, obj = pickle.loads(data)
+      except Exception:
+         return None
+      return obj if version == cacheVersion else None
+
+   def putObject(self, kind, key, obj):
+      self.put(kind, key, pickle.dumps((cacheVersion, obj), protocol=pickle.HIGHEST_PROTOCOL))
+
+   def evict(self):
+      entries = []
+      total = 0
+      for entry in os.scandir(self.path):
+         if entry.is_file() and not entry.name.startswith('.'):
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+            total = total + st.st_size
+
+      entries.sort()
+      for mtime, size, path in entries:
+         if total <= self.maxBytes:
+            break
+         try:
+            os.remove(path)
+         except OSError:
+            pass
+         total = total - size
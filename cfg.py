@@ -0,0 +1,305 @@
+from array import array
+from instructions import *
+from resolve import restartTarget
+
+# basic blocks and control flow over a decoded program. a block is three
+# ints (first address, end address, last instruction) in parallel arrays,
+# successors and calls are CSR style: the edges of block b are
+# targets[offsets[b]:offsets[b + 1]], so nothing here is a per node object.
+
+FALL = 0
+JUMP = 1
+INDIRECT = 2
+edgeKinds = ('fall', 'jump', 'indirect')
+
+# per opcode roles, indexed by the opcode byte
+jumpOps = frozenset(op.opcode for op in opcodeTable if op.branchType == BranchType.JUMP)
+returnOps = frozenset(op.opcode for op in opcodeTable if op.branchType == BranchType.RETURN)
+callOps = frozenset(op.opcode for op in opcodeTable if op.branchType == BranchType.CALL)
+restartOps = {op.opcode : restartTarget(op) for op in opcodeTable if restartTarget(op) is not None}
+# JMP, RET and PCHL never fall through, any jump or return ends a block
+noFallOps = frozenset((0xc3, 0xc9, 0xe9))
+blockEndOps = jumpOps | returnOps | noFallOps
+
+class ControlFlowGraph:
+   def __init__(self, program, session):
+      self.program = program
+      self.session = session
+      self.starts = array('l')
+      self.ends = array('l')
+      self.lasts = array('l')
+      # block index for every instruction start, -1 for data and gaps
+      self.blockAt = array('l', [-1]) * len(program.instrs)
+      self.offsets = array('l', [0])
+      self.targets = array('l')
+      self.kinds = bytearray()
+      self.callOffsets = array('l', [0])
+      self.callTargets = array('l')
+      # (INPORT / OUTPORT, port) -> block indexes, in address order
+      self.ports = {}
+      self.build()
+
+   def indirectTargets(self):
+      # PC -> [(target, kind)] from resolve.py when the session resolved
+      # them, and from emulate.py for PCHL targets seen running
+      out = {}
+      for found in (self.session.resolution, self.session.trace):
+         if found is not None:
+            for PC, target, kind in found.refs:
+               if (target, kind) not in out.get(PC, ()):
+                  out.setdefault(PC, []).append((target, kind))
+      return out
+
+   def build(self):
+      program = self.program
+      instrs = program.instrs
+      size = len(instrs)
+      indirect = self.indirectTargets()
+
+      # leaders: entry points and anything a branch, call or table goes to
+      leaders = set(self.session.entries)
+      for PC, line in program.items():
+         if line.insType != InstrType.BRANCH:
+            continue
+         opcode = line.op.opcode
+         if line.targetAddress is not None:
+            leaders.add(line.targetAddress)
+         elif opcode in restartOps:
+            leaders.add(restartOps[opcode])
+         for target, kind in indirect.get(PC, ()):
+            leaders.add(target)
+
+      starts = self.starts
+      ends = self.ends
+      lasts = self.lasts
+      blockAt = self.blockAt
+      calls = []
+      ports = self.ports
+      current = -1
+      nextPC = -1
+      for PC, line in program.items():
+         op = line.op
+         if op.insType == InstrType.JUNK:
+            current = -1
+            continue
+         if current < 0 or PC != nextPC or PC in leaders:
+            current = len(starts)
+            starts.append(PC)
+            ends.append(PC)
+            lasts.append(PC)
+         nextPC = PC + 1 + op.numOperands
+         blockAt[PC] = current
+         ends[current] = nextPC
+         lasts[current] = PC
+
+         opcode = op.opcode
+         if opcode in callOps:
+            calls.append((current, line.targetAddress))
+         elif opcode in restartOps:
+            calls.append((current, restartOps[opcode]))
+         elif op.insType == InstrType.INPORT or op.insType == InstrType.OUTPORT:
+            blocks = ports.setdefault((op.insType, line.operand1), [])
+            if not blocks or blocks[-1] != current:
+               blocks.append(current)
+         if PC in indirect:
+            for target, kind in indirect[PC]:
+               if kind == 'call':
+                  calls.append((current, target))
+         if opcode in blockEndOps:
+            current = -1
+
+      # successors, one block at a time so the CSR arrays fill in order
+      offsets = self.offsets
+      targets = self.targets
+      kinds = self.kinds
+      for b in range(len(starts)):
+         last = lasts[b]
+         opcode = instrs[last].op.opcode
+         if opcode in jumpOps:
+            self.addEdge(instrs[last].targetAddress, JUMP)
+         if opcode == 0xe9:
+            for target, kind in indirect.get(last, ()):
+               self.addEdge(target, INDIRECT)
+         if opcode not in noFallOps:
+            self.addEdge(ends[b], FALL)
+         offsets.append(len(targets))
+
+      # calls, grouped per calling block
+      calls.sort(key=lambda call: call[0])
+      callOffsets = self.callOffsets
+      callTargets = self.callTargets
+      i = 0
+      for b in range(len(starts)):
+         while i < len(calls) and calls[i][0] == b:
+            target = calls[i][1]
+            if 0 <= target < size and blockAt[target] >= 0 and starts[blockAt[target]] == target:
+               callTargets.append(blockAt[target])
+            i = i + 1
+         callOffsets.append(len(callTargets))
+
+   def addEdge(self, address, kind):
+      blockAt = self.blockAt
+      if 0 <= address < len(blockAt):
+         b = blockAt[address]
+         if b >= 0 and self.starts[b] == address:
+            self.targets.append(b)
+            self.kinds.append(kind)
+
+   def __len__(self):
+      return len(self.starts)
+
+   def __iter__(self):
+      # (index, start, end) with end exclusive
+      starts = self.starts
+      ends = self.ends
+      for b in range(len(starts)):
+         yield b, starts[b], ends[b]
+
+   def blockOf(self, address):
+      # index of the block holding the instruction covering address, or -1
+      start = self.program.startOf(address)
+      if start < 0:
+         return -1
+      return self.blockAt[start]
+
+   def successors(self, b):
+      return self.targets[self.offsets[b]:self.offsets[b + 1]]
+
+   def edges(self, b):
+      lo = self.offsets[b]
+      hi = self.offsets[b + 1]
+      return [(self.targets[i], edgeKinds[self.kinds[i]]) for i in range(lo, hi)]
+
+   def callees(self, b):
+      return self.callTargets[self.callOffsets[b]:self.callOffsets[b + 1]]
+
+   def predecessors(self):
+      # the reverse CSR, built on demand: (offsets, sources)
+      count = array('l', [0]) * (len(self.starts) + 1)
+      for t in self.targets:
+         count[t + 1] += 1
+      for b in range(len(self.starts)):
+         count[b + 1] += count[b]
+      sources = array('l', [0]) * len(self.targets)
+      fill = array('l', count)
+      for b in range(len(self.starts)):
+         for t in self.successors(b):
+            sources[fill[t]] = b
+            fill[t] += 1
+      return count, sources
+
+   def reach(self, roots, calls = True):
+      # blocks reachable from the root blocks, through calls too unless told
+      # not to. returns (seen flags per block, blocks in visiting order)
+      seen = bytearray(len(self.starts))
+      order = [r for r in set(roots) if r >= 0]
+      for r in order:
+         seen[r] = 1
+      offsets = self.offsets
+      targets = self.targets
+      callOffsets = self.callOffsets
+      callTargets = self.callTargets
+      i = 0
+      while i < len(order):
+         b = order[i]
+         i = i + 1
+         out = targets[offsets[b]:offsets[b + 1]]
+         if calls:
+            out = out + callTargets[callOffsets[b]:callOffsets[b + 1]]
+         for t in out:
+            if not seen[t]:
+               seen[t] = 1
+               order.append(t)
+      return seen, order
+
+   def roots(self):
+      # blocks starting at an entry point
+      out = []
+      for address in self.session.entries:
+         b = self.blockOf(address)
+         if b >= 0 and self.starts[b] == address:
+            out.append(b)
+      return out
+
+   def functionEntries(self):
+      # call targets and entry points, as block indexes in address order
+      return sorted(set(self.callTargets) | set(self.roots()))
+
+   def owners(self):
+      # the function entry block owning each block: a breadth first walk from
+      # every entry at once, stopping at blocks another function already took
+      owner = array('l', [-1]) * len(self.starts)
+      order = self.functionEntries()
+      for entry in order:
+         owner[entry] = entry
+      offsets = self.offsets
+      targets = self.targets
+      i = 0
+      while i < len(order):
+         b = order[i]
+         i = i + 1
+         for t in targets[offsets[b]:offsets[b + 1]]:
+            if owner[t] < 0:
+               owner[t] = owner[b]
+               order.append(t)
+      return owner
+
+   def functions(self):
+      # entry block -> the blocks it owns, in address order
+      out = {entry : [] for entry in self.functionEntries()}
+      for b, entry in enumerate(self.owners()):
+         if entry >= 0:
+            out[entry].append(b)
+      return out
+
+   def deadBlocks(self):
+      # code nothing reaches from the entry points
+      seen = self.reach(self.roots())[0]
+      return [b for b in range(len(seen)) if not seen[b]]
+
+   def port(self, nameOrNumber):
+      # accepts a port number or an inPorts / outPorts name from the .yml,
+      # KeyError for anything else
+      return self.session.lookup(nameOrNumber, ('inPorts', 'outPorts'))
+
+   def blocksTouchingPort(self, nameOrNumber):
+      number = self.port(nameOrNumber)
+      blocks = set(self.ports.get((InstrType.INPORT, number), ()))
+      blocks.update(self.ports.get((InstrType.OUTPORT, number), ()))
+      return sorted(blocks)
+
+   def functionsTouchingPort(self, nameOrNumber):
+      touching = set(self.blocksTouchingPort(nameOrNumber))
+      return [entry for entry, blocks in self.functions().items() if touching.intersection(blocks)]
+
+   def name(self, b):
+      address = self.starts[b]
+      session = self.session
+      return session.labelNames.get(address) or session.syms.get(address) or f"${rawAddr(address)}"
+
+   def toJSON(self, file):
+      import json
+      blocks = [{'id' : b, 'start' : f"${rawAddr(start)}", 'end' : f"${rawAddr(end - 1)}", 'name' : self.name(b)} for b, start, end in self]
+      edges = [{'from' : b, 'to' : t, 'kind' : kind} for b in range(len(self)) for t, kind in self.edges(b)]
+      calls = [{'from' : b, 'to' : t} for b in range(len(self)) for t in self.callees(b)]
+      json.dump({'blocks' : blocks, 'edges' : edges, 'calls' : calls, 'dead' : self.deadBlocks()}, file, separators=(',', ':'))
+
+   def toDOT(self, file):
+      style = ('dotted', 'solid', 'dashed')
+      file.write("digraph cfg {\n   node [shape=box fontname=monospace];\n")
+      for b, start, end in self:
+         file.write(f'   b{b} [label="{self.name(b)}\\n${rawAddr(start)}-${rawAddr(end - 1)}"];\n')
+      for b in range(len(self)):
+         lo = self.offsets[b]
+         for i in range(lo, self.offsets[b + 1]):
+            file.write(f"   b{b} -> b{self.targets[i]} [style={style[self.kinds[i]]}];\n")
+         for t in self.callees(b):
+            file.write(f"   b{b} -> b{t} [color=blue];\n")
+      file.write("}\n")
+
+   def export(self, path):
+      with open(path, 'w') as file:
+         if str(path).endswith(('.dot', '.gv')):
+            self.toDOT(file)
+         else:
+            self.toJSON(file)
@@ -0,0 +1,350 @@
+import heapq
+from array import array
+from instructions import *
+from cfg import ControlFlowGraph, FALL, callOps, restartOps, returnOps
+
+# 8085 T-states from the opcode table, indexed by the opcode byte. fewest is
+# the not taken count of a conditional branch, most the taken one; DB bytes
+# cost nothing since they never run.
+notTaken = bytes(op.cycles for op in opcodeTable)
+taken = bytes(op.cyclesTaken or op.cycles for op in opcodeTable)
+conditional = bytes(op.cyclesTaken is not None for op in opcodeTable)
+callTargets = {**{opcode : None for opcode in callOps}, **restartOps}
+
+def instructionCycles(line):
+   # (fewest, most) for one decoded instruction
+   if line.op.insType == InstrType.JUNK:
+      return 0, 0
+   return notTaken[line.op.opcode], taken[line.op.opcode]
+
+class CycleCounts:
+   # cycle bounds over a control flow graph: every block (its own
+   # instructions, callees not included), every subroutine (best and worst
+   # from entry to return, callees included) and every loop (one iteration).
+   # a worst case is None where it has no bound: a loop on the way, a
+   # recursive or unknown callee
+   def __init__(self, program, session, graph = None):
+      self.program = program
+      self.session = session
+      self.graph = graph or ControlFlowGraph(program, session)
+      graph = self.graph
+      count = len(graph)
+      self.owner = graph.owners()
+      # per block: summed fewest / most, the last opcode, and the calls made as (target block, conditional)
+      self.low = array('l', [0]) * count
+      self.high = array('l', [0]) * count
+      self.last = bytearray(count)
+      self.calls = [()] * count
+      self.blockCosts()
+      # entry block -> (best, worst), best None when it never returns
+      self.bounds = {}
+      self.functionBounds()
+      # (header block, blocks, best, worst) per iteration, inner loops too
+      self.loops = self.findLoops()
+
+   def blockCosts(self):
+      instrs = self.program.instrs
+      graph = self.graph
+      blockAt = graph.blockAt
+      starts = graph.starts
+      for b, start, end in graph:
+         low = high = 0
+         calls = []
+         PC = start
+         while PC < end:
+            line = instrs[PC]
+            opcode = line.op.opcode
+            low = low + notTaken[opcode]
+            high = high + taken[opcode]
+            if opcode in callTargets:
+               target = callTargets[opcode]
+               if target is None:
+                  target = line.targetAddress
+               callee = blockAt[target] if 0 <= target < len(blockAt) else -1
+               if callee >= 0 and starts[callee] != target:
+                  callee = -1
+               calls.append((callee, conditional[opcode]))
+            last = opcode
+            PC = PC + 1 + line.op.numOperands
+         self.low[b] = low
+         self.high[b] = high
+         self.last[b] = last
+         if calls:
+            self.calls[b] = tuple(calls)
+
+   def calleeCost(self, b, worst):
+      total = 0
+      for callee, isConditional in self.calls[b]:
+         if isConditional and not worst:
+            # skipping the call is the quickest way through
+            continue
+         cost = self.cost(callee, worst)
+         if cost is None:
+            return None
+         total = total + cost
+      return total
+
+   def cost(self, entry, worst):
+      # a finished subroutine's bound; unknown, recursive and never returning count as 0 best, no worst
+      bound = self.bounds.get(entry) if entry >= 0 else None
+      if bound is None:
+         return None if worst else 0
+      return bound[1] if worst else (bound[0] or 0)
+
+   def moves(self, b, worst):
+      # (cost, next block) out of b, next is -1 for leaving the subroutine
+      graph = self.graph
+      owner = self.owner
+      opcode = self.last[b]
+      calls = self.calleeCost(b, worst)
+      if calls is None:
+         return [(None, -1)]
+      if worst:
+         base = self.high[b] - taken[opcode] + calls
+      else:
+         base = self.low[b] - notTaken[opcode] + calls
+
+      out = []
+      lo = graph.offsets[b]
+      hi = graph.offsets[b + 1]
+      for i in range(lo, hi):
+         t = graph.targets[i]
+         cost = base + (notTaken[opcode] if graph.kinds[i] == FALL else taken[opcode])
+         if owner[t] != owner[b]:
+            # a tail jump into another subroutine
+            tail = self.cost(owner[t], worst)
+            out.append((None if tail is None else cost + tail, -1))
+         else:
+            out.append((cost, t))
+      if opcode in returnOps:
+         out.append((base + taken[opcode], -1))
+      elif lo == hi:
+         # HLT, an unresolved PCHL, a jump off the image: as far as anyone can tell
+         out.append((base + notTaken[opcode], -1))
+      return out
+
+   def shortest(self, start, goal, inside = None):
+      # fewest cycles from start to goal, or to any exit when goal is -1
+      dist = {start : 0}
+      heap = [(0, start)]
+      first = True
+      while heap:
+         d, b = heapq.heappop(heap)
+         if b == goal and not first:
+            return d
+         first = False
+         if d > dist.get(b, d):
+            continue
+         for cost, t in self.moves(b, False):
+            if t < 0:
+               if goal < 0:
+                  heapq.heappush(heap, (d + cost, -1))
+               continue
+            if inside is not None and t not in inside:
+               continue
+            if t == goal or d + cost < dist.get(t, d + cost + 1):
+               dist[t] = d + cost
+               heapq.heappush(heap, (d + cost, t))
+      return None
+
+   def longest(self, entry):
+      # most cycles from entry to an exit, None if a loop or an unbounded callee is on the way
+      order = []
+      state = {entry : 1}
+      work = [(entry, iter(self.moves(entry, True)))]
+      while work:
+         b, pending = work[-1]
+         for cost, t in pending:
+            if cost is None:
+               return None
+            if t < 0:
+               continue
+            seen = state.get(t, 0)
+            if seen == 1:
+               return None
+            if seen == 0:
+               state[t] = 1
+               work.append((t, iter(self.moves(t, True))))
+               break
+         else:
+            state[b] = 2
+            order.append(b)
+            work.pop()
+
+      most = {entry : 0}
+      worst = None
+      for b in reversed(order):
+         here = most[b]
+         for cost, t in self.moves(b, True):
+            if t < 0:
+               worst = here + cost if worst is None else max(worst, here + cost)
+            elif here + cost > most.get(t, -1):
+               most[t] = here + cost
+      return worst
+
+   def functionBounds(self):
+      # callees first, a walk over the call graph; recursion just sees no bound yet
+      graph = self.graph
+      owner = self.owner
+      depends = {entry : set() for entry in graph.functionEntries()}
+      for b in range(len(graph)):
+         f = owner[b]
+         if f < 0:
+            continue
+         depends[f].update(callee for callee, isConditional in self.calls[b] if callee >= 0 and callee != f)
+         depends[f].update(owner[t] for t in graph.successors(b) if owner[t] >= 0 and owner[t] != f)
+
+      state = {}
+      for root in depends:
+         if root in state:
+            continue
+         state[root] = 1
+         work = [(root, iter(depends[root]))]
+         while work:
+            f, pending = work[-1]
+            for g in pending:
+               if g in depends and g not in state:
+                  state[g] = 1
+                  work.append((g, iter(depends[g])))
+                  break
+            else:
+               work.pop()
+               self.bounds[f] = (self.shortest(f, -1), self.longest(f))
+               state[f] = 2
+
+   def components(self, blocks = None, cut = -1):
+      # strongly connected components over blocks (all of them by default),
+      # following edges inside one subroutine only and none into cut
+      graph = self.graph
+      owner = self.owner
+      offsets = graph.offsets
+      targets = graph.targets
+      within = None
+      if blocks is None:
+         blocks = range(len(graph))
+      else:
+         within = set(blocks)
+      index = {}
+      low = {}
+      onStack = set()
+      stack = []
+      out = []
+      for root in blocks:
+         if root in index:
+            continue
+         index[root] = low[root] = len(index)
+         stack.append(root)
+         onStack.add(root)
+         work = [[root, offsets[root]]]
+         while work:
+            top = work[-1]
+            v = top[0]
+            if top[1] < offsets[v + 1]:
+               w = targets[top[1]]
+               top[1] = top[1] + 1
+               if owner[w] != owner[v] or w == cut or (within is not None and w not in within):
+                  continue
+               if w not in index:
+                  index[w] = low[w] = len(index)
+                  stack.append(w)
+                  onStack.add(w)
+                  work.append([w, offsets[w]])
+               elif w in onStack and index[w] < low[v]:
+                  low[v] = index[w]
+               continue
+            work.pop()
+            if work and low[v] < low[work[-1][0]]:
+               low[work[-1][0]] = low[v]
+            if low[v] == index[v]:
+               component = []
+               while True:
+                  w = stack.pop()
+                  onStack.discard(w)
+                  component.append(w)
+                  if w == v:
+                     break
+               out.append(sorted(component))
+      return out
+
+   def loopsOf(self, blocks = None, cut = -1):
+      return [c for c in self.components(blocks, cut) if len(c) > 1 or (c[0] != cut and c[0] in self.graph.successors(c[0]))]
+
+   def findLoops(self):
+      # outer loops first, then what's left of each with its header taken out
+      out = []
+      pending = self.loopsOf()
+      while pending:
+         blocks = pending.pop()
+         header = self.header(blocks)
+         inner = self.loopsOf(blocks, header)
+         out.append(self.loopBounds(blocks, header, bool(inner)))
+         pending.extend(inner)
+      out.sort(key=lambda loop: (self.graph.starts[loop[0]], -len(loop[1])))
+      return out
+
+   def header(self, blocks):
+      # the block entered from outside the loop, else the first one
+      inside = set(blocks)
+      offsets, sources = self.predecessors()
+      for b in blocks:
+         if any(s not in inside for s in sources[offsets[b]:offsets[b + 1]]):
+            return b
+      return blocks[0]
+
+   def loopBounds(self, blocks, header, nested):
+      # best: the shortest way round from the header. worst: every block of
+      # the loop once, taking its dearest way out, no bound around an inner loop
+      inside = set(blocks)
+      worst = None
+      if not nested:
+         worst = 0
+         for b in blocks:
+            costs = [cost for cost, t in self.moves(b, True) if t in inside or cost is None]
+            if None in costs:
+               worst = None
+               break
+            worst = worst + max(costs)
+      return header, blocks, self.shortest(header, header, inside), worst
+
+   def predecessors(self):
+      if not hasattr(self, 'reverse'):
+         self.reverse = self.graph.predecessors()
+      return self.reverse
+
+   def annotations(self):
+      # (PC -> comment for the end of the line, PC -> note lines above it) for the listing
+      graph = self.graph
+      instrs = self.program.instrs
+      inline = {}
+      for b, start, end in graph:
+         PC = start
+         while PC < end:
+            opcode = instrs[PC].op.opcode
+            if conditional[opcode]:
+               inline[PC] = f"{notTaken[opcode]}/{taken[opcode]}"
+            else:
+               inline[PC] = f"{notTaken[opcode]}"
+            last = PC
+            PC = PC + 1 + instrs[PC].op.numOperands
+         if last != start:
+            inline[last] = f"{inline[last]}  block {bounds(self.low[b], self.high[b])}"
+
+      notes = {}
+      for entry, (best, worst) in self.bounds.items():
+         if best is None:
+            text = "cycles: subroutine never returns"
+         else:
+            text = f"cycles: subroutine {bounds(best, worst)}"
+         notes.setdefault(graph.starts[entry], []).append(text)
+      for header, blocks, best, worst in self.loops:
+         first = min(graph.starts[b] for b in blocks)
+         last = max(graph.ends[b] for b in blocks) - 1
+         notes.setdefault(graph.starts[header], []).append(f"cycles: loop ${rawAddr(first)}-${rawAddr(last)} {bounds(best, worst)} per iteration")
+      return inline, notes
+
+def bounds(best, worst):
+   if best is None:
+      best = "?"
+   if best == worst:
+      return f"{best}"
+   return f"{best}..{'?' if worst is None else worst}"
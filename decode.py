@@ -0,0 +1,285 @@
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from instructions import *
+
+# dense program store over the address space, everything is plain int indexing
+class Program:
+   def __init__(self, size = 0x10000):
+      size = max(size, 0x10000)
+      self.instrs = [None] * size
+      # start address of the instruction covering each byte, -1 if none
+      self.starts = array('l', [-1]) * size
+      self.order = []
+      self.sorted = True
+
+   def add(self, PC, instance):
+      if self.order and PC < self.order[-1]:
+         self.sorted = False
+      if self.instrs[PC] is None:
+         self.order.append(PC)
+      self.instrs[PC] = instance
+      starts = self.starts
+      for i in range(PC, min(PC + 1 + instance.numOperands, len(starts))):
+         starts[i] = PC
+
+   def load(self, pcs, instances, starts):
+      # bulk fill from the numpy backend: sorted pcs, their instances and the start of every byte
+      instrs = self.instrs
+      for PC, instance in zip(pcs, instances):
+         instrs[PC] = instance
+      self.order = pcs
+      self.sorted = True
+      self.starts = array('l')
+      self.starts.frombytes(starts)
+
+   def replaceSpan(self, start, end, items):
+      # swap the instructions starting in [start, end) for items, returns the old ones
+      order = self.order
+      if not self.sorted:
+         order.sort()
+         self.sorted = True
+      lo = bisect_left(order, start)
+      hi = bisect_left(order, end)
+
+      instrs = self.instrs
+      starts = self.starts
+      old = [(PC, instrs[PC]) for PC in order[lo:hi]]
+      for PC, instance in old:
+         instrs[PC] = None
+      for i in range(start, min(end, len(starts))):
+         starts[i] = -1
+
+      for PC, instance in items:
+         instrs[PC] = instance
+         for i in range(PC, min(PC + 1 + instance.numOperands, len(starts))):
+            starts[i] = PC
+      order[lo:hi] = [PC for PC, instance in items]
+      return old
+
+   def startOf(self, address):
+      if 0 <= address < len(self.starts):
+         return self.starts[address]
+      return -1
+
+   def __contains__(self, address):
+      return 0 <= address < len(self.instrs) and self.instrs[address] is not None
+
+   def __getitem__(self, address):
+      return self.instrs[address]
+
+   def __len__(self):
+      return len(self.order)
+
+   def __iter__(self):
+      if not self.sorted:
+         self.order.sort()
+         self.sorted = True
+      return iter(self.order)
+
+   def items(self):
+      instrs = self.instrs
+      for PC in self:
+         yield PC, instrs[PC]
+
+def sweep(image, dataMap, start = 0):
+   # linear sweep front end, yields (PC, opcode, operand1, operand2, data)
+   # one data map probe per line, added to dataMap.lookups when the sweep
+   # ends or its consumer stops early
+   bits = dataMap.bits
+   mapped = min(len(bits), len(image))
+   end = len(image)
+   PC = start
+   probes = 0
+
+   try:
+      while PC < end:
+         opcode = image[PC]
+
+         probes = probes + 1
+         if PC < mapped and bits[PC]:
+            yield PC, opcode, None, None, True
+            PC = PC + 1
+            continue
+
+         numOperands = opcodeTable[opcode].numOperands
+         if PC + numOperands >= end:
+            # operands run off the end of the image, dump what's left as data
+            while PC < end:
+               yield PC, image[PC], None, None, True
+               PC = PC + 1
+            return
+
+         operand1 = None
+         operand2 = None
+         if numOperands >= 1:
+            operand1 = image[PC + 1]
+         if numOperands == 2:
+            operand2 = image[PC + 2]
+
+         yield PC, opcode, operand1, operand2, False
+         PC = PC + 1 + numOperands
+   finally:
+      dataMap.lookups = dataMap.lookups + probes
+
+def linearSweep(image, session, start = 0):
+   for PC, opcode, operand1, operand2, data in sweep(image, session.dataMap, start):
+      if data:
+         yield PC, DecodedInstruction(dataOpcodeTable[opcode], session)
+      else:
+         yield PC, DecodedInstruction(opcodeTable[opcode], session, operand1, operand2)
+
+def settled(program, dataMap, PC):
+   # an old start any sweep reaching PC lands on too: a real instruction or a
+   # data map byte. a DB dumped for an instruction cut off by the end of the
+   # image isn't one, the sweep may now cover it with a whole instruction
+   line = program.instrs[PC]
+   return line is not None and program.startOf(PC) == PC and (line.insType != InstrType.JUNK or PC in dataMap)
+
+def resync(program, image, session, address):
+   # make address an instruction start: the bytes of the instruction it lands
+   # in become DB and the sweep restarts there, until it meets the old alignment
+   start = program.startOf(address)
+   if start < 0 or (start == address and program[address].insType != InstrType.JUNK) or address in session.dataMap:
+      return
+   items = [(PC, DecodedInstruction(dataOpcodeTable[image[PC]], session)) for PC in range(start, address)]
+   end = len(image)
+   for PC, opcode, operand1, operand2, data in sweep(image, session.dataMap, address):
+      if PC > address and settled(program, session.dataMap, PC):
+         end = PC
+         break
+      if data:
+         items.append((PC, DecodedInstruction(dataOpcodeTable[opcode], session)))
+      else:
+         items.append((PC, DecodedInstruction(opcodeTable[opcode], session, operand1, operand2)))
+   for PC, instance in items:
+      instance.address = PC
+   program.replaceSpan(start, end, items)
+
+# the numpy backend (fast.py) is used whenever numpy is already loaded. a cold
+# import costs about as much as it saves on one image, so a one shot run only
+# pulls it in for a full address space. MATDASM_PURE=1 keeps to plain Python.
+acceleratedSize = 0x10000
+
+def accelerated(size):
+   if os.environ.get('MATDASM_PURE'):
+      return None
+   if size < acceleratedSize and 'numpy' not in sys.modules:
+      return None
+   try:
+      import fast
+   except ImportError:
+      return None
+   return fast
+
+def warmBackend():
+   # for long running processes that decode many images
+   accelerated(acceleratedSize)
+
+# RST 0-7, TRAP and RST 5.5 / 6.5 / 7.5
+vectorEntries = (0x00, 0x08, 0x10, 0x18, 0x20, 0x24, 0x28, 0x2c, 0x30, 0x34, 0x38, 0x3c)
+
+# JMP, RET and PCHL never fall through to the next instruction
+flowEnds = frozenset((0xc3, 0xc9, 0xe9))
+
+def flowDecode(image, session, entries = vectorEntries):
+   # recursive descent from the entry points, returns {PC : instruction}
+   dataMap = session.dataMap
+   end = len(image)
+   owned = bytearray(end)
+   owned[:min(end, len(dataMap.bits))] = dataMap.bits[:end]
+   decoded = {}
+   work = [e for e in entries if e < end]
+
+   while work:
+      PC = work.pop()
+
+      while PC < end and not owned[PC]:
+         op = opcodeTable[image[PC]]
+         nextPC = PC + 1 + op.numOperands
+
+         # stop at the end of the image or when we'd run into decoded bytes
+         if nextPC > end or any(owned[PC + 1:nextPC]):
+            break
+         owned[PC:nextPC] = b'\x01' * (nextPC - PC)
+
+         operand1 = None
+         operand2 = None
+         if op.numOperands >= 1:
+            operand1 = image[PC + 1]
+         if op.numOperands == 2:
+            operand2 = image[PC + 2]
+
+         instance = DecodedInstruction(op, session, operand1, operand2)
+         decoded[PC] = instance
+
+         if op.operandType == OperandType.ADDRESS and op.branchType in (BranchType.JUMP, BranchType.CALL):
+            work.append(instance.targetAddress)
+
+         if op.opcode in flowEnds:
+            break
+         PC = nextPC
+
+   return decoded
+
+def flowSweep(image, session, entries = vectorEntries):
+   # reachable code in address order, everything else becomes DB
+   decoded = flowDecode(image, session, entries)
+   end = len(image)
+   PC = 0
+
+   while PC < end:
+      instance = decoded.get(PC)
+      if instance is None:
+         yield PC, DecodedInstruction(dataOpcodeTable[image[PC]], session)
+         PC = PC + 1
+      else:
+         yield PC, instance
+         PC = PC + 1 + instance.numOperands
+
+def packProgram(program, size):
+   # one byte per address: 1 starts an instruction, 2 is a DB byte
+   kinds = bytearray(size)
+   for PC in program:
+      kinds[PC] = 2 if program[PC].insType == InstrType.JUNK else 1
+   return bytes(kinds)
+
+def unpackProgram(image, kinds, session):
+   program = Program(len(image))
+   for PC in range(len(kinds)):
+      kind = kinds[PC]
+      if kind == 1:
+         op = opcodeTable[image[PC]]
+         operand1 = image[PC + 1] if op.numOperands >= 1 else None
+         operand2 = image[PC + 2] if op.numOperands == 2 else None
+         program.add(PC, DecodedInstruction(op, session, operand1, operand2))
+      elif kind == 2:
+         program.add(PC, DecodedInstruction(dataOpcodeTable[image[PC]], session))
+   return program
+
+def linkLabels(program, session, xref = None):
+   for addr in program:
+      line = program[addr]
+      line.address = addr
+      if xref is not None:
+         xref.add(addr, line)
+
+      # walk through all jumps and calls
+      if line.insType == InstrType.BRANCH:
+         if line.operandType == OperandType.ADDRESS:
+            #  no label for it? make one, 
+            label = session.makeLabel(line.targetAddress)
+
+            # find the instruction that is called
+            if line.targetAddress in program:
+               target = program[line.targetAddress]
+
+               # label the target
+               target.label = label
+               line.targetLabel = label
+
+               # label the line
+               line.label = session.makeLabel(line.address)
+               line.label.setOrigin()
+               label.addCaller(line)
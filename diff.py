@@ -0,0 +1,429 @@
+import os
+import sys
+import json
+import time
+from bisect import bisect_right
+from difflib import SequenceMatcher
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from argparse import ArgumentParser
+
+from instructions import *
+from decode import linearSweep
+from utils import loadImage
+
+# two revisions of a ROM: line the bytes up, decode only the stretches that
+# differ (plus a little context on each side), and compare those as
+# instructions with addresses mapped through the alignment, so a routine that
+# only moved because something above it grew doesn't show up as a change.
+
+# anchor windows, a byte run must be about twice this long to be found
+anchorSize = 8
+# changes closer than this many bytes go in one hunk
+mergeDistance = 16
+# byte identical runs out of order and at least this long are reported as moved
+minMove = 16
+# routines shorter than this are too common to say where one went
+minRoutine = 4
+# hunks bigger than this on either side aren't worth an instruction level diff
+maxListed = 0x1000
+
+lengths = bytes(op.numOperands + 1 for op in opcodeTable)
+# JMP, RET and PCHL end a routine
+routineEnds = frozenset((0xc3, 0xc9, 0xe9))
+relocatable = (OperandType.ADDRESS, OperandType.IMMEDIATE_HYBRID)
+
+def commonPrefix(a, i, b, j, limit):
+   # equal bytes from a[i] / b[j] on, galloping with slice compares
+   n = 0
+   step = 256
+   while step:
+      while n + step <= limit and a[i + n:i + n + step] == b[j + n:j + n + step]:
+         n = n + step
+      step = step >> 1
+   return n
+
+def commonSuffix(a, i, b, j, limit):
+   # equal bytes just before a[i] / b[j]
+   n = 0
+   step = 256
+   while step:
+      while n + step <= limit and a[i - n - step:i - n] == b[j - n - step:j - n]:
+         n = n + step
+      step = step >> 1
+   return n
+
+def anchors(a, b, k = anchorSize):
+   # (aStart, bStart, length) byte matches in b order, not overlapping in b.
+   # a is indexed every k bytes, b is looked up at every offset until a hit
+   # is extended both ways; the last match's offset is tried first, so runs
+   # of filler line up with the copy in the same place
+   index = {}
+   for i in range(0, len(a) - k + 1, k):
+      index.setdefault(a[i:i + k], i)
+
+   matches = []
+   delta = 0
+   prevEnd = 0
+   j = 0
+   while j <= len(b) - k:
+      window = b[j:j + k]
+      i = j + delta
+      if i < 0 or a[i:i + k] != window:
+         i = index.get(window)
+         if i is None:
+            j = j + 1
+            continue
+      back = commonSuffix(a, i, b, j, min(i, j - prevEnd))
+      n = k + commonPrefix(a, i + k, b, j + k, min(len(a) - i, len(b) - j) - k)
+      matches.append((i - back, j - back, back + n))
+      delta = i - j
+      prevEnd = j + n
+      j = prevEnd
+   return matches
+
+def chain(matches, size):
+   # the heaviest set of matches in order in both images, as a longest
+   # increasing run weighted by length: a Fenwick tree holds the best chain
+   # ending at or before each offset of a
+   tree = [0] * (size + 2)
+   at = [-1] * (size + 2)
+   back = [-1] * len(matches)
+   best = 0
+   last = -1
+   for m, (i, j, n) in enumerate(matches):
+      weight = 0
+      prev = -1
+      x = i + 1
+      while x > 0:
+         if tree[x] > weight:
+            weight = tree[x]
+            prev = at[x]
+         x = x - (x & -x)
+      back[m] = prev
+      weight = weight + n
+      if weight > best:
+         best = weight
+         last = m
+      x = i + n + 1
+      while x <= size + 1:
+         if tree[x] < weight:
+            tree[x] = weight
+            at[x] = m
+         x = x + (x & -x)
+
+   out = []
+   while last >= 0:
+      out.append(matches[last])
+      last = back[last]
+   out.reverse()
+   return out
+
+class Alignment:
+   def __init__(self, a, b):
+      self.sizes = (len(a), len(b))
+      self.matches = anchors(a, b)
+      self.chain = chain(self.matches, len(a))
+      self.aStarts = [i for i, j, n in self.chain]
+
+   def matched(self):
+      return sum(n for i, j, n in self.chain)
+
+   def toB(self, address):
+      # where an address in a ended up in b, by the offset of the nearest match at or before it
+      if address >= self.sizes[0] or not self.chain:
+         return address
+      m = bisect_right(self.aStarts, address) - 1
+      i, j, n = self.chain[max(m, 0)]
+      return address + j - i
+
+   def gaps(self):
+      # (a0, a1, b0, b1) between matches, ends exclusive, at least one side non empty
+      out = []
+      a = b = 0
+      for i, j, n in self.chain + [(self.sizes[0], self.sizes[1], 0)]:
+         if i > a or j > b:
+            out.append((a, i, b, j))
+         a = i + n
+         b = j + n
+      return out
+
+   def hunks(self, distance = mergeDistance):
+      out = []
+      for a0, a1, b0, b1 in self.gaps():
+         if out and a0 - out[-1][1] <= distance and b0 - out[-1][3] <= distance:
+            out[-1] = (out[-1][0], a1, out[-1][2], b1)
+         else:
+            out.append((a0, a1, b0, b1))
+      return out
+
+   def moves(self):
+      # byte runs that matched, just not in order
+      kept = set(self.chain)
+      return [(i, j, n) for i, j, n in self.matches if n >= minMove and (i, j, n) not in kept]
+
+def syncPoints(image, bits, addresses):
+   # the linear sweep's instruction start at or before each address, one walk over the lengths
+   mapped = min(len(bits), len(image))
+   end = len(image)
+   out = {}
+   PC = prev = 0
+   for address in sorted(set(addresses)):
+      while PC <= address and PC < end:
+         prev = PC
+         PC = PC + (1 if PC < mapped and bits[PC] else lengths[image[PC]])
+      out[address] = prev
+   return out
+
+def decodeRange(image, session, start, stop):
+   out = []
+   for PC, instance in linearSweep(image, session, start):
+      if PC >= stop:
+         break
+      instance.address = PC
+      out.append(instance)
+   return out
+
+def key(line, relocate = None):
+   # what two lines have to share to count as the same instruction
+   op = line.op
+   if op.insType == InstrType.JUNK:
+      return (0x100, op.opcode)
+   if op.numOperands == 2:
+      value = line.operand1 | (line.operand2 << 8)
+      if relocate is not None and op.operandType in relocatable:
+         value = relocate(value)
+      return (op.opcode, value)
+   if op.numOperands == 1:
+      return (op.opcode, line.operand1)
+   return op.opcode
+
+def fingerprint(routine):
+   # opcodes and operands, with addresses inside the routine made relative
+   # and addresses outside it all alike
+   first = routine[0].address
+   last = routine[-1]
+   end = last.address + 1 + last.op.numOperands
+   parts = []
+   for line in routine:
+      op = line.op
+      if op.numOperands == 2 and op.operandType in relocatable:
+         value = line.operand1 | (line.operand2 << 8)
+         parts.append((op.opcode, value - first if first <= value < end else -1))
+      else:
+         parts.append(key(line))
+   return tuple(parts)
+
+def routines(lines):
+   # (first, end) index runs of instructions ending at an unconditional jump or return
+   out = []
+   first = 0
+   for i, line in enumerate(lines):
+      if line.op.insType == InstrType.JUNK:
+         first = i + 1
+      elif line.op.opcode in routineEnds:
+         if i + 1 - first >= minRoutine:
+            out.append((first, i + 1))
+         first = i + 1
+   return out
+
+def touching(lines, changed):
+   return [lines[first:end] for first, end in routines(lines) if any(i in changed for i in range(first, end))]
+
+def lineText(line):
+   return f"${rawAddr(line.address)}  {str(line).strip()}"
+
+def loadSide(path, session = None):
+   import matdasm
+   if session is None:
+      symPath = matdasm.symbolPath(path)
+      session = matdasm.makeSession(symPath if symPath.is_file() else None, binaryops = True)
+   return bytes(loadImage(path)), session
+
+def compare(aPath, bPath, context = 3, sessions = (None, None)):
+   start = time.perf_counter()
+   a, aSession = loadSide(aPath, sessions[0])
+   b, bSession = loadSide(bPath, sessions[1])
+   alignment = Alignment(a, b)
+   hunks = alignment.hunks()
+
+   # start decoding far enough back to have the context, on the sweep's own alignment
+   reach = 3 * context
+   aSync = syncPoints(a, aSession.dataMap.bits, [max(0, a0 - reach) for a0, a1, b0, b1 in hunks])
+   bSync = syncPoints(b, bSession.dataMap.bits, [max(0, b0 - reach) for a0, a1, b0, b1 in hunks])
+
+   result = {
+      'a' : str(aPath),
+      'b' : str(bPath),
+      'sizes' : [len(a), len(b)],
+      'matched' : alignment.matched(),
+      'hunks' : [],
+      'relocated' : 0,
+      'moved' : [],
+   }
+   # routines from the decoded hunks that take in at least one changed line
+   aRoutines = []
+   bRoutines = []
+   for a0, a1, b0, b1 in hunks:
+      if a1 - a0 > maxListed or b1 - b0 > maxListed:
+         # unrelated images, or a rewrite: just say how much
+         result['hunks'].append({'a' : [a0, max(a0, a1 - 1)], 'b' : [b0, max(b0, b1 - 1)], 'lines' : [f"; {a1 - a0} bytes replaced by {b1 - b0}, not listed"]})
+         continue
+      aLines = decodeRange(a, aSession, aSync[max(0, a0 - reach)], a1 + reach)
+      bLines = decodeRange(b, bSession, bSync[max(0, b0 - reach)], b1 + reach)
+      matcher = SequenceMatcher(None, [key(line, alignment.toB) for line in aLines], [key(line) for line in bLines])
+      groups = [group for group in matcher.get_grouped_opcodes(context) if any(tag != 'equal' for tag, i1, i2, j1, j2 in group)]
+      if not groups:
+         # only addresses that moved with the code around them
+         result['relocated'] += 1
+         continue
+
+      aChanged = set()
+      bChanged = set()
+      for group in groups:
+         out = []
+         for tag, i1, i2, j1, j2 in group:
+            if tag == 'equal':
+               out.extend(f" {lineText(line)}" for line in aLines[i1:i2])
+               continue
+            out.extend(f"-{lineText(line)}" for line in aLines[i1:i2])
+            out.extend(f"+{lineText(line)}" for line in bLines[j1:j2])
+            aChanged.update(range(i1, i2))
+            bChanged.update(range(j1, j2))
+         tag, i1, i2, j1, j2 = group[0]
+         last = group[-1]
+         aSpan = aLines[i1:last[2]]
+         bSpan = bLines[j1:last[4]]
+         result['hunks'].append({
+            'a' : [aSpan[0].address, aSpan[-1].address] if aSpan else [a0, a0],
+            'b' : [bSpan[0].address, bSpan[-1].address] if bSpan else [b0, b0],
+            'lines' : out,
+         })
+      aRoutines.extend(touching(aLines, aChanged))
+      bRoutines.extend(touching(bLines, bChanged))
+
+   result['moved'] = moved(alignment, aRoutines, bRoutines)
+   result['seconds'] = round(time.perf_counter() - start, 4)
+   return result
+
+def moved(alignment, aRoutines, bRoutines):
+   # routines that left one place and turned up in another, relocated or not
+   found = []
+   candidates = {}
+   for routine in aRoutines:
+      candidates.setdefault(fingerprint(routine), []).append(routine)
+   for routine in bRoutines:
+      sources = candidates.get(fingerprint(routine))
+      if sources and alignment.toB(sources[0][0].address) != routine[0].address:
+         source = sources.pop(0)
+         found.append({
+            'a' : [source[0].address, source[-1].address],
+            'b' : [routine[0].address, routine[-1].address],
+            'instructions' : len(routine),
+            'kind' : 'routine',
+         })
+
+   for i, j, n in alignment.moves():
+      if not any(m['a'][0] <= i + n - 1 and i <= m['a'][1] for m in found):
+         found.append({'a' : [i, i + n - 1], 'b' : [j, j + n - 1], 'bytes' : n, 'kind' : 'bytes'})
+   found.sort(key=lambda m: m['a'][0])
+   return found
+
+def changed(result):
+   return bool(result['hunks'] or result['moved'])
+
+def formatResult(result):
+   out = [f"--- {result['a']}", f"+++ {result['b']}"]
+   for hunk in result['hunks']:
+      (a0, a1), (b0, b1) = hunk['a'], hunk['b']
+      out.append(f"@@ -${rawAddr(a0)},${rawAddr(a1)} +${rawAddr(b0)},${rawAddr(b1)} @@")
+      out.extend(hunk['lines'])
+   for m in result['moved']:
+      (a0, a1), (b0, b1) = m['a'], m['b']
+      size = f"{m['instructions']} instructions" if m['kind'] == 'routine' else f"{m['bytes']} bytes"
+      out.append(f"moved ${rawAddr(a0)}-${rawAddr(a1)} -> ${rawAddr(b0)}-${rawAddr(b1)} ({size})")
+   out.append(f"; {len(result['hunks'])} hunks, {result['relocated']} relocation only, {len(result['moved'])} moved, {result['matched']} of {result['sizes'][0]}/{result['sizes'][1]} bytes aligned")
+   return "\n".join(out) + "\n"
+
+def diffOne(aPath, bPath, output, context, asJSON = False):
+   summary = {'a' : aPath, 'b' : bPath, 'output' : output}
+   try:
+      result = compare(aPath, bPath, context)
+      with open(output, 'w') as file:
+         if asJSON:
+            json.dump(result, file, indent=1)
+         else:
+            file.write(formatResult(result))
+      summary.update({key : result[key] for key in ('matched', 'relocated', 'seconds')})
+      summary['hunks'] = len(result['hunks'])
+      summary['moved'] = len(result['moved'])
+      summary['error'] = None
+   except Exception as e:
+      summary['error'] = f"{type(e).__name__}: {e}"
+   return summary
+
+def readPairs(path):
+   # one "a.bin b.bin" pair per line
+   pairs = []
+   with open(path) as file:
+      for line in file:
+         line = line.strip()
+         if line and not line.startswith('#'):
+            a, b = line.split()
+            pairs.append((a, b))
+   return pairs
+
+def runPairs(pairs, outdir, jobs = None, context = 3, asJSON = False):
+   os.makedirs(outdir, exist_ok=True)
+   jobs = max(1, min(jobs or os.cpu_count() or 1, len(pairs) or 1))
+   suffix = '.json' if asJSON else '.diff'
+   outputs = [str(Path(outdir) / f"{Path(a).name}__{Path(b).name}{suffix}") for a, b in pairs]
+
+   results = []
+   with ProcessPoolExecutor(max_workers=jobs) as pool:
+      futures = [pool.submit(diffOne, a, b, output, context, asJSON) for (a, b), output in zip(pairs, outputs)]
+      for future in as_completed(futures):
+         results.append(future.result())
+   results.sort(key=lambda r: r['output'])
+   return results
+
+def main(argv = None):
+   parser = ArgumentParser(prog='matdasm diff')
+   parser.add_argument('inputs', nargs='*', help='old and new binary, a .bin.yml next to each is picked up', type=str)
+   parser.add_argument('-C', '--context', help='lines of context around each change', default=3, type=int)
+   parser.add_argument('-o', '--output', help='write the diff to a file instead of stdout', type=str)
+   parser.add_argument('--json', help='hunks, moved routines and counts as json', action="store_true", default=False)
+   parser.add_argument('-p', '--pairs', help='file with one "old new" pair per line, diffed in a process pool', type=str)
+   parser.add_argument('-d', '--outdir', help='directory for --pairs output and summary.json', default='diffs', type=str)
+   parser.add_argument('-j', '--jobs', help='worker processes for --pairs (default: cpu count)', type=int)
+   args = parser.parse_args(argv)
+
+   if args.pairs:
+      start = time.perf_counter()
+      results = runPairs(readPairs(args.pairs), args.outdir, args.jobs, args.context, args.json)
+      elapsed = time.perf_counter() - start
+      failed = [r for r in results if r['error']]
+      with open(Path(args.outdir) / "summary.json", 'w') as file:
+         json.dump({'pairs' : len(results), 'failed' : len(failed), 'seconds' : round(elapsed, 4), 'results' : results}, file, indent=2)
+      for r in results:
+         if r['error']:
+            print(f"FAIL {r['a']} {r['b']}: {r['error']}")
+         else:
+            print(f"ok   {r['a']} {r['b']} -> {r['output']} ({r['hunks']} hunks, {r['moved']} moved, {r['seconds']}s)")
+      print(f"{len(results)} pairs, {len(failed)} failed, {elapsed:.2f}s")
+      return 1 if failed else 0
+
+   if len(args.inputs) != 2:
+      parser.error("need an old and a new binary, or --pairs")
+   result = compare(args.inputs[0], args.inputs[1], args.context)
+   text = json.dumps(result, indent=1) + "\n" if args.json else formatResult(result)
+   if args.output:
+      with open(args.output, 'w') as file:
+         file.write(text)
+   else:
+      sys.stdout.write(text)
+   # like diff(1): 1 when something changed
+   return 1 if changed(result) else 0
+
+if __name__ == '__main__':
+   sys.exit(main())
@@ -0,0 +1,107 @@
+import sys
+from instructions import addrStr
+
+def formatChunk(pc, l, session):
+   # the note, spacer and instruction lines for one address, newline terminated
+   out = []
+   if pc in session.notes:
+      out.append(f"; {session.notes[pc]}\n")
+   if session.addresses:
+      if l.label and l.label.isCall:
+         out.append(" \n")
+      out.append(f"{addrStr(pc, session.syms)} {l}\n")
+   else:
+      out.append(f"{l}\n")
+   return "".join(out)
+
+# where annotated listings start their end of line comments
+commentColumn = 40
+
+# buffered listing writer, lines are collected and written in large joins
+class Emitter:
+   def __init__(self, path = None, flushAt = 4096):
+      if path is None:
+         self.file = sys.stdout
+         self.owned = False
+      elif hasattr(path, 'write'):
+         self.file = path
+         self.owned = False
+      else:
+         self.file = open(path, mode='w', buffering=1 << 20)
+         self.owned = True
+      self.flushAt = flushAt
+      self.lines = []
+
+   def line(self, text):
+      lines = self.lines
+      lines.append(text)
+      if len(lines) >= self.flushAt:
+         self.flush()
+
+   def header(self, session):
+      for text in session.header:
+         self.line(text)
+
+   def program(self, program, session):
+      if session.cycleNotes is not None:
+         self.annotated(program, session, *session.cycleNotes)
+         return
+      notes = session.notes
+      syms = session.syms
+      addresses = session.addresses
+      line = self.line
+
+      for pc in program:
+         if pc in notes:
+            line(f"; {notes[pc]}")
+         l = program[pc]
+         if addresses:
+            if l.label and l.label.isCall:
+               line(" ")
+            line(f"{addrStr(pc, syms)} {l}")
+         else:
+            line(l.__str__())
+
+   def annotated(self, program, session, inline, extra):
+      # program() with a comment on the end of each line and extra note lines
+      notes = session.notes
+      syms = session.syms
+      addresses = session.addresses
+      line = self.line
+
+      for pc in program:
+         if pc in notes:
+            line(f"; {notes[pc]}")
+         for text in extra.get(pc, ()):
+            line(f"; {text}")
+         l = program[pc]
+         text = l.__str__()
+         if addresses:
+            if l.label and l.label.isCall:
+               line(" ")
+            text = f"{addrStr(pc, syms)} {text}"
+         if pc in inline:
+            # before the blank line RET leaves, padded on the last line of a wrapped label
+            body = text.rstrip("\n")
+            width = len(body) - body.rfind("\n") - 1
+            text = f"{body}{' ' * max(1, commentColumn - width)}; {inline[pc]}{text[len(body):]}"
+         line(text)
+
+   def flush(self):
+      if self.lines:
+         self.lines.append("")
+         self.file.write("\n".join(self.lines))
+         self.lines = []
+
+   def close(self):
+      self.flush()
+      if self.owned:
+         self.file.close()
+      else:
+         self.file.flush()
+
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *exc):
+      self.close()
@@ -0,0 +1,724 @@
+from instructions import *
+from decode import resync
+
+# a plain 8085: 64K of bytearray memory with the ROM at 0 (writes to it are
+# dropped), registers in one list, and one small function per opcode that
+# takes PC and returns the next PC. the run loop does nothing but fetch,
+# count and dispatch, so it stays in the low millions of instructions per
+# second. conditional branches that are taken add their extra T-states on
+# the side; everything else costs the opcode table's cycles.
+#
+# the undocumented V and K flags aren't modelled: RSTV never restarts, JNK
+# always jumps, JK never does.
+
+B, C, D, E, H, L, F, A, SP, IE, MASK = range(11)
+# (HL) in the register field of an opcode, where F sits in the register list
+M = 6
+
+# flags
+CY = 0x01
+P = 0x04
+AC = 0x10
+Z = 0x40
+S = 0x80
+
+szp = bytes((v & S) | (Z if v == 0 else 0) | (P if bin(v).count('1') % 2 == 0 else 0) for v in range(256))
+cost = bytes(op.cycles for op in opcodeTable)
+# NZ Z NC C PO PE P M as (mask, value)
+conditions = ((Z, 0), (Z, Z), (CY, 0), (CY, CY), (P, 0), (P, P), (S, 0), (S, S))
+
+# SIM mask bits of the RST 5.5, 6.5 and 7.5 vectors
+maskBits = {0x2c : 0x01, 0x34 : 0x02, 0x3c : 0x04}
+
+class Halted(Exception):
+   def __init__(self, PC):
+      self.PC = PC
+
+class Emulator:
+   def __init__(self, image, session = None, inputs = None, outputs = None, floating = 0xff):
+      # inputs / outputs map a port number, or an inPorts / outPorts name
+      # from the .yml, to a stub: inputs are called with no arguments and
+      # return a byte (or are a plain int), outputs are called with the byte
+      # two bytes past $ffff mirror $0000 / $0001, so an operand fetched at the
+      # top of memory wraps without masking every fetch. they're kept read
+      # only so the mirror can't go stale
+      self.rom = max(min(len(image), 0x10000), 2)
+      self.mem = bytearray(0x10002)
+      self.mem[:self.rom] = image[:self.rom]
+      self.mem[0x10000:] = self.mem[:2]
+      self.session = session
+      self.R = [0] * 11
+      self.R[SP] = 0xffff
+      self.PC = 0
+      self.cycles = 0
+      # taken branch T-states beyond the table's not taken counts
+      self.extra = [0]
+      self.halted = False
+      # executions per address, and (PC, target) for every PCHL taken
+      self.hits = [0] * 0x10000
+      self.indirect = set()
+      self.inputs = [floating] * 256
+      self.outputs = [None] * 256
+      for port, stub in (inputs or {}).items():
+         self.inputs[self.port(port, 'inPorts')] = stub
+      for port, stub in (outputs or {}).items():
+         self.outputs[self.port(port, 'outPorts')] = stub
+      self.handlers = self.build()
+
+   def port(self, nameOrNumber, table):
+      # KeyError for a name that's neither in the table nor a number
+      if self.session is not None:
+         return self.session.lookup(nameOrNumber, (table,))
+      if isinstance(nameOrNumber, int):
+         return nameOrNumber
+      from utils import hexParse
+      try:
+         return hexParse(nameOrNumber)
+      except ValueError:
+         raise KeyError(f"unknown symbol {nameOrNumber}") from None
+
+   def read(self, port):
+      stub = self.inputs[port]
+      return (stub() if callable(stub) else stub) & 0xff
+
+   def write(self, port, value):
+      stub = self.outputs[port]
+      if stub is not None:
+         stub(value)
+
+   def build(self):
+      R = self.R
+      mem = self.mem
+      rom = self.rom
+      extra = self.extra
+      indirect = self.indirect
+      emulator = self
+      handlers = [None] * 256
+
+      def nop(PC):
+         return PC + 1
+
+      def halt(PC):
+         raise Halted(PC)
+
+      # moves
+      def movRR(d, s):
+         def h(PC, R=R):
+            R[d] = R[s]
+            return PC + 1
+         return h
+
+      def movRM(d):
+         def h(PC, R=R, mem=mem):
+            R[d] = mem[(R[H] << 8) | R[L]]
+            return PC + 1
+         return h
+
+      def movMR(s):
+         def h(PC, R=R, mem=mem, rom=rom):
+            address = (R[H] << 8) | R[L]
+            if address >= rom:
+               mem[address] = R[s]
+            return PC + 1
+         return h
+
+      def mvi(d):
+         def h(PC, R=R, mem=mem):
+            R[d] = mem[PC + 1]
+            return PC + 2
+         return h
+
+      def mviM(PC, R=R, mem=mem, rom=rom):
+         address = (R[H] << 8) | R[L]
+         if address >= rom:
+            mem[address] = mem[PC + 1]
+         return PC + 2
+
+      def lxi(hi):
+         def h(PC, R=R, mem=mem):
+            R[hi] = mem[PC + 2]
+            R[hi + 1] = mem[PC + 1]
+            return PC + 3
+         return h
+
+      def lxiSP(PC, R=R, mem=mem):
+         R[SP] = mem[PC + 1] | (mem[PC + 2] << 8)
+         return PC + 3
+
+      def lda(PC, R=R, mem=mem):
+         R[A] = mem[mem[PC + 1] | (mem[PC + 2] << 8)]
+         return PC + 3
+
+      def sta(PC, R=R, mem=mem, rom=rom):
+         address = mem[PC + 1] | (mem[PC + 2] << 8)
+         if address >= rom:
+            mem[address] = R[A]
+         return PC + 3
+
+      def lhld(PC, R=R, mem=mem):
+         address = mem[PC + 1] | (mem[PC + 2] << 8)
+         R[L] = mem[address]
+         R[H] = mem[(address + 1) & 0xffff]
+         return PC + 3
+
+      def shld(PC, R=R, mem=mem, rom=rom):
+         address = mem[PC + 1] | (mem[PC + 2] << 8)
+         if address >= rom:
+            mem[address] = R[L]
+         address = (address + 1) & 0xffff
+         if address >= rom:
+            mem[address] = R[H]
+         return PC + 3
+
+      def ldax(hi):
+         def h(PC, R=R, mem=mem):
+            R[A] = mem[(R[hi] << 8) | R[hi + 1]]
+            return PC + 1
+         return h
+
+      def stax(hi):
+         def h(PC, R=R, mem=mem, rom=rom):
+            address = (R[hi] << 8) | R[hi + 1]
+            if address >= rom:
+               mem[address] = R[A]
+            return PC + 1
+         return h
+
+      def xchg(PC, R=R):
+         R[D], R[E], R[H], R[L] = R[H], R[L], R[D], R[E]
+         return PC + 1
+
+      # 16 bit
+      def inx(hi, step):
+         def h(PC, R=R):
+            value = (((R[hi] << 8) | R[hi + 1]) + step) & 0xffff
+            R[hi] = value >> 8
+            R[hi + 1] = value & 0xff
+            return PC + 1
+         return h
+
+      def inxSP(step):
+         def h(PC, R=R):
+            R[SP] = (R[SP] + step) & 0xffff
+            return PC + 1
+         return h
+
+      def dad(hi):
+         def h(PC, R=R):
+            other = R[SP] if hi == SP else (R[hi] << 8) | R[hi + 1]
+            value = ((R[H] << 8) | R[L]) + other
+            R[F] = (R[F] & ~CY) | (value >> 16)
+            R[H] = (value >> 8) & 0xff
+            R[L] = value & 0xff
+            return PC + 1
+         return h
+
+      # 8 bit arithmetic, the operand from a register, (HL) or the next byte
+      def alu(operation, source):
+         if source == 'imm':
+            def h(PC, R=R, mem=mem):
+               operation(R, mem[PC + 1])
+               return PC + 2
+         elif source == M:
+            def h(PC, R=R, mem=mem):
+               operation(R, mem[(R[H] << 8) | R[L]])
+               return PC + 1
+         else:
+            def h(PC, R=R):
+               operation(R, R[source])
+               return PC + 1
+         return h
+
+      def add(R, v):
+         a = R[A]
+         r = a + v
+         R[F] = szp[r & 0xff] | (r >> 8) | ((a ^ v ^ r) & AC)
+         R[A] = r & 0xff
+
+      def adc(R, v):
+         a = R[A]
+         r = a + v + (R[F] & CY)
+         R[F] = szp[r & 0xff] | (r >> 8) | ((a ^ v ^ r) & AC)
+         R[A] = r & 0xff
+
+      def sub(R, v):
+         a = R[A]
+         r = a - v
+         R[F] = szp[r & 0xff] | (CY if r < 0 else 0) | ((a ^ v ^ r) & AC)
+         R[A] = r & 0xff
+
+      def sbb(R, v):
+         a = R[A]
+         r = a - v - (R[F] & CY)
+         R[F] = szp[r & 0xff] | (CY if r < 0 else 0) | ((a ^ v ^ r) & AC)
+         R[A] = r & 0xff
+
+      def ana(R, v):
+         r = R[A] & v
+         R[F] = szp[r] | AC
+         R[A] = r
+
+      def xra(R, v):
+         r = R[A] ^ v
+         R[F] = szp[r]
+         R[A] = r
+
+      def ora(R, v):
+         r = R[A] | v
+         R[F] = szp[r]
+         R[A] = r
+
+      def cmp(R, v):
+         a = R[A]
+         r = a - v
+         R[F] = szp[r & 0xff] | (CY if r < 0 else 0) | ((a ^ v ^ r) & AC)
+
+      operations = (add, adc, sub, sbb, ana, xra, ora, cmp)
+
+      def inr(d):
+         def h(PC, R=R):
+            r = (R[d] + 1) & 0xff
+            R[F] = (R[F] & CY) | szp[r] | (AC if r & 0x0f == 0 else 0)
+            R[d] = r
+            return PC + 1
+         return h
+
+      def dcr(d):
+         def h(PC, R=R):
+            r = (R[d] - 1) & 0xff
+            R[F] = (R[F] & CY) | szp[r] | (AC if r & 0x0f != 0x0f else 0)
+            R[d] = r
+            return PC + 1
+         return h
+
+      def inrM(step):
+         def h(PC, R=R, mem=mem, rom=rom):
+            address = (R[H] << 8) | R[L]
+            r = (mem[address] + step) & 0xff
+            if step > 0:
+               R[F] = (R[F] & CY) | szp[r] | (AC if r & 0x0f == 0 else 0)
+            else:
+               R[F] = (R[F] & CY) | szp[r] | (AC if r & 0x0f != 0x0f else 0)
+            if address >= rom:
+               mem[address] = r
+            return PC + 1
+         return h
+
+      def rlc(PC, R=R):
+         a = R[A]
+         c = a >> 7
+         R[A] = ((a << 1) | c) & 0xff
+         R[F] = (R[F] & ~CY) | c
+         return PC + 1
+
+      def rrc(PC, R=R):
+         a = R[A]
+         c = a & 1
+         R[A] = (a >> 1) | (c << 7)
+         R[F] = (R[F] & ~CY) | c
+         return PC + 1
+
+      def ral(PC, R=R):
+         a = R[A]
+         R[A] = ((a << 1) | (R[F] & CY)) & 0xff
+         R[F] = (R[F] & ~CY) | (a >> 7)
+         return PC + 1
+
+      def rar(PC, R=R):
+         a = R[A]
+         R[A] = (a >> 1) | ((R[F] & CY) << 7)
+         R[F] = (R[F] & ~CY) | (a & 1)
+         return PC + 1
+
+      def daa(PC, R=R):
+         a = R[A]
+         f = R[F]
+         carry = f & CY
+         correction = 0
+         if a & 0x0f > 9 or f & AC:
+            correction = 0x06
+         if a > 0x99 or carry:
+            correction = correction | 0x60
+            carry = CY
+         r = a + correction
+         R[F] = szp[r & 0xff] | ((a ^ correction ^ r) & AC) | carry
+         R[A] = r & 0xff
+         return PC + 1
+
+      def cma(PC, R=R):
+         R[A] = R[A] ^ 0xff
+         return PC + 1
+
+      def stc(PC, R=R):
+         R[F] = R[F] | CY
+         return PC + 1
+
+      def cmc(PC, R=R):
+         R[F] = R[F] ^ CY
+         return PC + 1
+
+      # stack
+      def push(value, R=R, mem=mem, rom=rom):
+         sp = (R[SP] - 2) & 0xffff
+         R[SP] = sp
+         if sp >= rom:
+            mem[sp] = value & 0xff
+         sp = (sp + 1) & 0xffff
+         if sp >= rom:
+            mem[sp] = value >> 8
+
+      def pop(R=R, mem=mem):
+         sp = R[SP]
+         R[SP] = (sp + 2) & 0xffff
+         return mem[sp] | (mem[(sp + 1) & 0xffff] << 8)
+
+      def pushPair(hi, lo):
+         def h(PC, R=R):
+            push((R[hi] << 8) | R[lo])
+            return PC + 1
+         return h
+
+      def popPair(hi, lo):
+         def h(PC, R=R):
+            value = pop()
+            R[hi] = value >> 8
+            R[lo] = value & 0xff
+            return PC + 1
+         return h
+
+      def xthl(PC, R=R, mem=mem, rom=rom):
+         sp = R[SP]
+         l = mem[sp]
+         h = mem[(sp + 1) & 0xffff]
+         if sp >= rom:
+            mem[sp] = R[L]
+         if (sp + 1) & 0xffff >= rom:
+            mem[(sp + 1) & 0xffff] = R[H]
+         R[L] = l
+         R[H] = h
+         return PC + 1
+
+      def sphl(PC, R=R):
+         R[SP] = (R[H] << 8) | R[L]
+         return PC + 1
+
+      # branches
+      def jmp(PC, mem=mem):
+         return mem[PC + 1] | (mem[PC + 2] << 8)
+
+      def jcc(mask, value):
+         def h(PC, R=R, mem=mem):
+            if R[F] & mask == value:
+               extra[0] += 3
+               return mem[PC + 1] | (mem[PC + 2] << 8)
+            return PC + 3
+         return h
+
+      def call(PC, mem=mem):
+         push(PC + 3)
+         return mem[PC + 1] | (mem[PC + 2] << 8)
+
+      def ccc(mask, value):
+         def h(PC, R=R, mem=mem):
+            if R[F] & mask == value:
+               extra[0] += 9
+               push(PC + 3)
+               return mem[PC + 1] | (mem[PC + 2] << 8)
+            return PC + 3
+         return h
+
+      def ret(PC):
+         return pop()
+
+      def rcc(mask, value):
+         def h(PC, R=R):
+            if R[F] & mask == value:
+               extra[0] += 6
+               return pop()
+            return PC + 1
+         return h
+
+      def rst(target):
+         def h(PC):
+            push(PC + 1)
+            return target
+         return h
+
+      def pchl(PC, R=R):
+         target = (R[H] << 8) | R[L]
+         indirect.add((PC, target))
+         return target
+
+      # I/O and control
+      def inPort(PC, R=R, mem=mem):
+         R[A] = emulator.read(mem[PC + 1])
+         return PC + 2
+
+      def outPort(PC, R=R, mem=mem):
+         emulator.write(mem[PC + 1], R[A])
+         return PC + 2
+
+      def ei(PC, R=R):
+         R[IE] = 1
+         return PC + 1
+
+      def di(PC, R=R):
+         R[IE] = 0
+         return PC + 1
+
+      def rim(PC, R=R):
+         R[A] = (R[MASK] & 0x07) | (0x08 if R[IE] else 0)
+         return PC + 1
+
+      def sim(PC, R=R):
+         if R[A] & 0x08:
+            R[MASK] = R[A] & 0x07
+         return PC + 1
+
+      # the undocumented ones
+      def dsub(PC, R=R):
+         value = ((R[H] << 8) | R[L]) - ((R[B] << 8) | R[C])
+         R[F] = (R[F] & ~CY) | (CY if value < 0 else 0)
+         R[H] = (value >> 8) & 0xff
+         R[L] = value & 0xff
+         return PC + 1
+
+      def arhl(PC, R=R):
+         R[F] = (R[F] & ~CY) | (R[L] & 1)
+         R[L] = ((R[H] & 1) << 7) | (R[L] >> 1)
+         R[H] = (R[H] & 0x80) | (R[H] >> 1)
+         return PC + 1
+
+      def rdel(PC, R=R):
+         value = (R[D] << 9) | (R[E] << 1) | (R[F] & CY)
+         R[F] = (R[F] & ~CY) | (value >> 16)
+         R[D] = (value >> 8) & 0xff
+         R[E] = value & 0xff
+         return PC + 1
+
+      def ldhi(PC, R=R, mem=mem):
+         value = (((R[H] << 8) | R[L]) + mem[PC + 1]) & 0xffff
+         R[D] = value >> 8
+         R[E] = value & 0xff
+         return PC + 2
+
+      def ldsi(PC, R=R, mem=mem):
+         value = (R[SP] + mem[PC + 1]) & 0xffff
+         R[D] = value >> 8
+         R[E] = value & 0xff
+         return PC + 2
+
+      def shlx(PC, R=R, mem=mem, rom=rom):
+         address = (R[D] << 8) | R[E]
+         if address >= rom:
+            mem[address] = R[L]
+         address = (address + 1) & 0xffff
+         if address >= rom:
+            mem[address] = R[H]
+         return PC + 1
+
+      def lhlx(PC, R=R, mem=mem):
+         address = (R[D] << 8) | R[E]
+         R[L] = mem[address]
+         R[H] = mem[(address + 1) & 0xffff]
+         return PC + 1
+
+      def jnk(PC, mem=mem):
+         extra[0] += 3
+         return mem[PC + 1] | (mem[PC + 2] << 8)
+
+      def skip3(PC):
+         return PC + 3
+
+      for opcode in range(0x40, 0x80):
+         d = (opcode >> 3) & 7
+         s = opcode & 7
+         if opcode == 0x76:
+            handlers[opcode] = halt
+         elif s == M:
+            handlers[opcode] = movRM(d)
+         elif d == M:
+            handlers[opcode] = movMR(s)
+         else:
+            handlers[opcode] = movRR(d, s)
+      for opcode in range(0x80, 0xc0):
+         handlers[opcode] = alu(operations[(opcode >> 3) & 7], opcode & 7)
+      for i, operation in enumerate(operations):
+         handlers[0xc6 | (i << 3)] = alu(operation, 'imm')
+
+      for r in range(8):
+         if r == M:
+            handlers[0x34] = inrM(1)
+            handlers[0x35] = inrM(-1)
+            handlers[0x36] = mviM
+         else:
+            handlers[0x04 | (r << 3)] = inr(r)
+            handlers[0x05 | (r << 3)] = dcr(r)
+            handlers[0x06 | (r << 3)] = mvi(r)
+
+      for i, hi in enumerate((B, D, H)):
+         handlers[0x01 | (i << 4)] = lxi(hi)
+         handlers[0x03 | (i << 4)] = inx(hi, 1)
+         handlers[0x0b | (i << 4)] = inx(hi, -1)
+         handlers[0x09 | (i << 4)] = dad(hi)
+         handlers[0xc1 | (i << 4)] = popPair(hi, hi + 1)
+         handlers[0xc5 | (i << 4)] = pushPair(hi, hi + 1)
+      handlers[0x31] = lxiSP
+      handlers[0x33] = inxSP(1)
+      handlers[0x3b] = inxSP(-1)
+      handlers[0x39] = dad(SP)
+      handlers[0xf1] = popPair(A, F)
+      handlers[0xf5] = pushPair(A, F)
+
+      for i, (mask, value) in enumerate(conditions):
+         handlers[0xc0 | (i << 3)] = rcc(mask, value)
+         handlers[0xc2 | (i << 3)] = jcc(mask, value)
+         handlers[0xc4 | (i << 3)] = ccc(mask, value)
+         handlers[0xc7 | (i << 3)] = rst(i << 3)
+
+      for opcode, handler in {
+         0x00 : nop, 0x02 : stax(B), 0x07 : rlc, 0x08 : dsub, 0x0a : ldax(B), 0x0f : rrc,
+         0x10 : arhl, 0x12 : stax(D), 0x17 : ral, 0x18 : rdel, 0x1a : ldax(D), 0x1f : rar,
+         0x20 : rim, 0x22 : shld, 0x27 : daa, 0x28 : ldhi, 0x2a : lhld, 0x2f : cma,
+         0x30 : sim, 0x32 : sta, 0x37 : stc, 0x38 : ldsi, 0x3a : lda, 0x3f : cmc,
+         0xc3 : jmp, 0xc9 : ret, 0xcb : nop, 0xcd : call,
+         0xd3 : outPort, 0xd9 : shlx, 0xdb : inPort, 0xdd : jnk,
+         0xe3 : xthl, 0xe9 : pchl, 0xeb : xchg, 0xed : lhlx,
+         0xf3 : di, 0xf9 : sphl, 0xfb : ei, 0xfd : skip3,
+      }.items():
+         handlers[opcode] = handler
+      # the stores below ROM are dropped, interrupts push through the same code
+      self.push = push
+      return handlers
+
+   def interrupt(self, vector):
+      # TRAP ($24) can't be masked, the rest need EI and turn interrupts off,
+      # RST 5.5 / 6.5 / 7.5 can also be masked by SIM
+      R = self.R
+      if vector != 0x24 and (not R[IE] or R[MASK] & maskBits.get(vector, 0)):
+         return False
+      R[IE] = 0
+      self.halted = False
+      # acknowledged like an RST: 12 T-states
+      self.push(self.PC)
+      self.PC = vector
+      self.cycles = self.cycles + 12
+      return True
+
+   def run(self, cycles, interrupts = ()):
+      # run for about this many T-states, with (vector, period) interrupts
+      # raised every period T-states. stops early on HLT with nothing to
+      # wake it. returns the T-states spent so far
+      mem = self.mem
+      hits = self.hits
+      handlers = self.handlers
+      if any(period < 1 for vector, period in interrupts):
+         raise ValueError(f"interrupt periods must be at least 1 T-state: {list(interrupts)}")
+      limit = self.cycles + cycles
+      due = [(self.cycles + period, vector, period) for vector, period in interrupts]
+      while self.cycles < limit:
+         stop = min([limit] + [when for when, vector, period in due])
+         PC = self.PC
+         spent = self.cycles
+         start = spent
+         if not self.halted:
+            try:
+               while spent < stop:
+                  opcode = mem[PC]
+                  hits[PC] += 1
+                  PC = handlers[opcode](PC) & 0xffff
+                  spent += cost[opcode]
+            except Halted as halt:
+               PC = (halt.PC + 1) & 0xffff
+               hits[halt.PC] += 1
+               spent += cost[0x76]
+               self.halted = True
+         self.PC = PC
+         self.cycles = spent
+         if self.halted:
+            # asleep until the next interrupt, if there is one that can wake it
+            if not due:
+               break
+            self.cycles = max(self.cycles, stop)
+         for i, (when, vector, period) in enumerate(due):
+            if self.cycles >= when:
+               self.interrupt(vector)
+               due[i] = (when + period, vector, period)
+         if self.halted and not self.R[IE] and all(vector != 0x24 for when, vector, period in due):
+            break
+      return self.total()
+
+   def total(self):
+      return self.cycles + self.extra[0]
+
+   def trace(self):
+      return Trace(self)
+
+class Trace:
+   # what a run saw: executions per address, PCHL targets, the cycles spent
+   def __init__(self, emulator):
+      self.hits = emulator.hits
+      self.indirect = sorted(emulator.indirect)
+      self.cycles = emulator.total()
+      self.instructions = sum(emulator.hits)
+      # the same shape as resolve.Resolution.refs, for labelIndirect and the cfg
+      self.refs = [(PC, target, 'jump') for PC, target in self.indirect]
+
+   def starts(self):
+      return [address for address, count in enumerate(self.hits) if count]
+
+   def histogram(self):
+      # (address, executions), busiest first
+      return sorted(((address, count) for address, count in enumerate(self.hits) if count), key=lambda row: (-row[1], row[0]))
+
+   def rows(self, session = None):
+      for address, count in self.histogram():
+         name = ""
+         if session is not None:
+            name = session.syms.get(address) or session.labelNames.get(address) or ""
+         yield {'address' : address, 'count' : count, 'name' : name}
+
+   def toJSON(self, file, session = None):
+      import json
+      json.dump({
+         'cycles' : self.cycles,
+         'instructions' : self.instructions,
+         'indirect' : [[f"${rawAddr(PC)}", f"${rawAddr(target)}"] for PC, target in self.indirect],
+         'histogram' : [dict(row, address=f"${rawAddr(row['address'])}") for row in self.rows(session)],
+      }, file, indent=1)
+
+   def toCSV(self, file, session = None):
+      import csv
+      writer = csv.writer(file)
+      writer.writerow(('address', 'count', 'name'))
+      for row in self.rows(session):
+         writer.writerow((f"${rawAddr(row['address'])}", row['count'], row['name']))
+
+   def export(self, path, session = None):
+      with open(path, 'w', newline='') as file:
+         if str(path).endswith('.csv'):
+            self.toCSV(file, session)
+         else:
+            self.toJSON(file, session)
+
+def emulate(image, session, cycles, inputs = None, outputs = None, interrupts = (), start = 0):
+   emulator = Emulator(image, session, inputs, outputs)
+   emulator.PC = start
+   emulator.run(cycles, interrupts)
+   return emulator.trace()
+
+def confirmCode(program, image, session, trace):
+   # every executed instruction start is code: in flow mode an entry point,
+   # in a linear sweep a resync point. .yml data ranges still win.
+   # returns the program, decoded again where it had to be
+   confirmed = [address for address in trace.starts() if address < len(image) and address not in session.dataMap]
+   missing = [address for address in confirmed if program.startOf(address) != address or program[address].insType == InstrType.JUNK]
+   if not missing:
+      return program
+   if session.flow:
+      known = set(session.entries)
+      session.entries.extend(address for address in missing if address not in known)
+      return session.sweepProgram(image)
+   for address in missing:
+      resync(program, image, session, address)
+   return program
@@ -0,0 +1,135 @@
+import numpy as np
+from instructions import *
+from decode import Program
+from xref import dataRefs
+
+# numpy backend for the linear sweep and the label pass. instruction starts
+# come from pointer doubling over a per byte "next instruction" array, branch
+# targets from gathers, and only the Python objects are built one by one.
+# everything it produces is identical to decode.linearSweep / linkLabels.
+
+lengths = np.array([op.numOperands + 1 for op in opcodeTable], dtype=np.int64)
+linkable = np.array([op.insType == InstrType.BRANCH and op.operandType == OperandType.ADDRESS for op in opcodeTable])
+# the only lines XrefIndex.add does anything with, all three bytes long
+referencing = linkable | np.array([op.opcode in dataRefs for op in opcodeTable])
+
+def asArray(image):
+   return np.frombuffer(image, dtype=np.uint8)
+
+def instructionStarts(code, bits, start = 0):
+   # (starts, data) where data marks the starts that are DB bytes
+   end = len(code)
+   if start >= end:
+      return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+
+   data = np.zeros(end, dtype=bool)
+   mapped = min(end, len(bits))
+   data[:mapped] = np.frombuffer(bits, dtype=np.uint8, count=mapped) != 0
+
+   step = lengths[code]
+   step[data] = 1
+   # jump[i] is where the instruction at i hands over, end is a fixed point
+   jump = np.empty(end + 1, dtype=np.int64)
+   jump[:end] = np.minimum(np.arange(end) + step, end)
+   jump[end] = end
+
+   # after k rounds reached holds the first 2**k starts and jump skips 2**k of them
+   reached = np.array([start], dtype=np.int64)
+   span = 1
+   while span <= end - start:
+      reached = np.concatenate((reached, jump[reached]))
+      jump = jump[jump]
+      span = span * 2
+   starts = np.unique(reached)
+   starts = starts[starts < end]
+   isData = data[starts]
+
+   # operands running off the end turn everything from there on into DB bytes
+   over = ~isData & (starts + step[starts] > end)
+   if over.any():
+      first = int(np.argmax(over))
+      tail = int(starts[first])
+      starts = np.concatenate((starts[:first], np.arange(tail, end)))
+      isData = np.concatenate((isData[:first], np.ones(end - tail, dtype=bool)))
+   return starts, isData
+
+def decodeProgram(image, session, start = 0):
+   code = asArray(image)
+   end = len(code)
+   starts, isData = instructionStarts(code, session.dataMap.bits, start)
+
+   opcodes = code[starts]
+   operands = np.zeros((2, len(starts)), dtype=np.int64)
+   padded = np.concatenate((code, np.zeros(2, dtype=np.uint8)))
+   operands[0] = padded[starts + 1]
+   operands[1] = padded[starts + 2]
+   size = np.where(isData, 1, lengths[opcodes])
+
+   instances = []
+   append = instances.append
+   table = opcodeTable
+   dataTable = dataOpcodeTable
+   for PC, opcode, operand1, operand2, data in zip(starts.tolist(), opcodes.tolist(), operands[0].tolist(), operands[1].tolist(), isData.tolist()):
+      if data:
+         instance = DecodedInstruction(dataTable[opcode], session)
+      else:
+         op = table[opcode]
+         numOperands = op.numOperands
+         instance = DecodedInstruction(op, session, operand1 if numOperands >= 1 else None, operand2 if numOperands == 2 else None)
+      instance.address = PC
+      append(instance)
+
+   program = Program(end)
+   covering = np.full(len(program.starts), -1, dtype=np.int64)
+   if len(starts):
+      covering[int(starts[0]):end] = np.repeat(starts, size)[:end - int(starts[0])]
+   program.load(starts.tolist(), instances, covering.astype(np.dtype('l')).tobytes())
+   return program
+
+def linkProgram(program, session, xref = None):
+   # linkLabels with the per line scan done in numpy: only lines that can
+   # reference something are visited, in address order like the original
+   instrs = program.instrs
+   order = list(program)
+   for PC in order:
+      instrs[PC].address = PC
+   if not order:
+      return
+
+   pcs = np.array(order, dtype=np.int64)
+   size = len(instrs)
+   covering = np.array(program.starts, dtype=np.int64)
+   isStart = np.zeros(size, dtype=bool)
+   isStart[pcs] = True
+
+   # opcodes and operands straight from the instances would be per line
+   # Python, the three byte ops are recognised by their covering starts
+   last = pcs + 2
+   inside = last < size
+   candidates = pcs[inside]
+   code = candidates[covering[last[inside]] == candidates]
+   if not len(code):
+      return
+   opcodes = np.array([instrs[PC].op.opcode for PC in code.tolist()], dtype=np.int64)
+   keep = referencing[opcodes]
+   code = code[keep]
+   opcodes = opcodes[keep]
+   branches = linkable[opcodes]
+
+   lines = [instrs[PC] for PC in code.tolist()]
+   targets = np.array([line.operand1 + (line.operand2 << 8) for line in lines], dtype=np.int64)
+   present = isStart[targets]
+
+   makeLabel = session.makeLabel
+   for PC, line, target, branch, found in zip(code.tolist(), lines, targets.tolist(), branches.tolist(), present.tolist()):
+      if xref is not None:
+         xref.add(PC, line)
+      if not branch:
+         continue
+      label = makeLabel(target)
+      if found:
+         instrs[target].label = label
+         line.targetLabel = label
+         line.label = makeLabel(PC)
+         line.label.setOrigin()
+         label.addCaller(line)
@@ -0,0 +1,243 @@
+import time
+from instructions import *
+from decode import sweep, settled
+from session import DisassemblySession
+from emitter import formatChunk
+
+def isLinkable(instance):
+   return instance.insType == InstrType.BRANCH and instance.operandType == OperandType.ADDRESS
+
+# keeps a labelled, rendered program around and patches it when only the
+# symbol file changes: renames re-render the lines that show the name, new
+# not_code ranges re-decode just the span until the old alignment resumes.
+class IncrementalDisassembler:
+   def __init__(self, image, symbols = None, addresses = False, binaryops = False, flow = False, entries = ()):
+      self.image = image
+      self.options = (addresses, binaryops, flow, tuple(entries))
+      self.rebuild(symbols)
+
+   def newSession(self, symbols):
+      addresses, binaryops, flow, entries = self.options
+      session = DisassemblySession(addresses, binaryops, flow)
+      session.applySymbols(symbols)
+      session.entries.extend(entries)
+      return session
+
+   def rebuild(self, symbols):
+      self.session = self.newSession(symbols)
+      self.program = self.session.decode(self.image)
+      self.session.link(self.program)
+
+      self.branchRefs = {}
+      self.valueRefs = {}
+      self.portRefs = {}
+      for PC in self.program:
+         self.index(PC, self.program[PC])
+
+      self.chunks = {}
+      self.render(self.program)
+
+   def index(self, PC, instance, remove = False):
+      # reverse maps from an address / port to the lines that display it
+      if instance.insType == InstrType.JUNK:
+         return
+      keys = []
+      if isLinkable(instance):
+         keys.append((self.branchRefs, instance.targetAddress))
+      if instance.numOperands == 2:
+         keys.append((self.valueRefs, instance.operand1 + (instance.operand2 << 8)))
+      if instance.insType in (InstrType.INPORT, InstrType.OUTPORT):
+         keys.append((self.portRefs, (instance.insType, instance.operand1)))
+
+      for refs, key in keys:
+         if remove:
+            refs[key].discard(PC)
+         else:
+            refs.setdefault(key, set()).add(PC)
+
+   def render(self, pcs):
+      program = self.program
+      session = self.session
+      for PC in pcs:
+         if PC in program:
+            self.chunks[PC] = formatChunk(PC, program[PC], session)
+         else:
+            self.chunks.pop(PC, None)
+
+   def text(self):
+      header = "".join(f"{line}\n" for line in self.session.header)
+      chunks = self.chunks
+      return header + "".join(chunks[PC] for PC in self.program)
+
+   def write(self, path):
+      with open(path, 'w') as file:
+         file.write(self.text())
+
+   def dependents(self, address):
+      # lines that print the label at address: its own line, the lines
+      # branching to it and the line listing it as a caller
+      out = {address}
+      out.update(self.branchRefs.get(address, ()))
+      if address in self.program:
+         instance = self.program[address]
+         if instance.targetLabel is not None:
+            out.add(instance.targetAddress)
+      return out
+
+   def update(self, symbols):
+      start = time.perf_counter()
+      fresh = self.newSession(symbols)
+      old = self.session
+
+      # entry points only matter, and data ranges matter globally, when following flow
+      dataChanged = old.dataMap.bits != fresh.dataMap.bits
+      if old.flow and (dataChanged or old.entries != fresh.entries):
+         self.rebuild(symbols)
+         return {'mode' : 'full', 'lines' : len(self.program), 'seconds' : time.perf_counter() - start}
+
+      dirty = set()
+      xref = old.xref
+      pointers = []
+      for address in changedKeys(old.syms, fresh.syms):
+         dirty.update(self.valueRefs.get(address, ()))
+         dirty.add(address)
+         # LXI only counts as a reference when it names a symbol
+         for PC in self.valueRefs.get(address, ()):
+            pointers.append((PC, self.program[PC]))
+            xref.add(PC, self.program[PC], remove = True)
+      for address in changedKeys(old.labelNames, fresh.labelNames):
+         dirty.update(self.dependents(address))
+      for port in changedKeys(old.inPorts, fresh.inPorts):
+         dirty.update(self.portRefs.get((InstrType.INPORT, port), ()))
+      for port in changedKeys(old.outPorts, fresh.outPorts):
+         dirty.update(self.portRefs.get((InstrType.OUTPORT, port), ()))
+      dirty.update(changedKeys(old.notes, fresh.notes))
+
+      # swap the new tables into the live session, instructions keep pointing at it
+      oldDataMap = old.dataMap
+      for name in ('syms', 'labelNames', 'inPorts', 'outPorts', 'notes', 'dataMap', 'entries', 'header', 'symbolSources', 'nameIndexes'):
+         setattr(old, name, getattr(fresh, name))
+      for PC, instance in pointers:
+         xref.add(PC, instance)
+
+      mode = 'render'
+      if dataChanged:
+         mode = 'redecode'
+         dirty.update(self.redecode(changedRegions(oldDataMap, old.dataMap)))
+
+      self.render(dirty)
+      return {'mode' : mode, 'lines' : len(dirty), 'seconds' : time.perf_counter() - start}
+
+   def redecode(self, regions):
+      program = self.program
+      image = self.image
+      end = len(image)
+      touched = set()
+      removed = []
+      added = []
+
+      i = 0
+      while i < len(regions):
+         first, last = regions[i]
+         i = i + 1
+         spanStart = program.startOf(first)
+         if spanStart < 0:
+            spanStart = first
+         if spanStart >= end:
+            continue
+
+         # decode until we land on an old instruction start past the change
+         items = []
+         spanEnd = end
+         for PC, opcode, operand1, operand2, data in sweep(image, self.session.dataMap, spanStart):
+            while i < len(regions) and regions[i][0] <= PC + 2:
+               last = max(last, regions[i][1])
+               i = i + 1
+            if PC > last and settled(program, self.session.dataMap, PC):
+               spanEnd = PC
+               break
+            if data:
+               instance = DecodedInstruction(dataOpcodeTable[opcode], self.session)
+            else:
+               instance = DecodedInstruction(opcodeTable[opcode], self.session, operand1, operand2)
+            instance.address = PC
+            items.append((PC, instance))
+
+         old = program.replaceSpan(spanStart, spanEnd, items)
+         removed.extend(old)
+         added.extend(items)
+
+      xref = self.session.xref
+      for PC, instance in removed:
+         self.index(PC, instance, remove = True)
+         xref.add(PC, instance, remove = True)
+         self.chunks.pop(PC, None)
+      for PC, instance in added:
+         self.index(PC, instance)
+         xref.add(PC, instance)
+
+      # every address whose link state can differ after the swap
+      targets = set()
+      for PC, instance in removed + added:
+         targets.add(PC)
+         if isLinkable(instance):
+            targets.add(instance.targetAddress)
+
+      for target in targets:
+         touched.update(self.relink(target))
+      return touched
+
+   def relink(self, target):
+      # recompute what linkLabels would have produced for one branch target
+      program = self.program
+      session = self.session
+      refs = sorted(self.branchRefs.get(target, ()))
+      present = target in program
+      touched = set()
+
+      label = session.makeLabel(target) if refs else session.labels.get(target)
+      if label is not None:
+         label.jumpers = [program[PC] for PC in refs] if present else []
+         label.isJump = any(j.branchType == BranchType.JUMP for j in label.jumpers)
+         label.isCall = any(j.branchType == BranchType.CALL for j in label.jumpers)
+
+      for PC in refs:
+         program[PC].targetLabel = label if present else None
+         self.relabel(PC)
+         touched.update(self.dependents(PC))
+
+      self.relabel(target)
+      touched.update(self.dependents(target))
+      return touched
+
+   def relabel(self, address):
+      if address not in self.program:
+         return
+      instance = self.program[address]
+      label = self.session.labels.get(address)
+      origin = isLinkable(instance) and instance.targetAddress in self.program
+      if origin:
+         label = self.session.makeLabel(address)
+      if label is not None:
+         label.isOrigin = origin
+         instance.label = label if (origin or label.jumpers) else None
+      else:
+         instance.label = None
+
+def changedKeys(old, new):
+   return {k for k in old.keys() | new.keys() if old.get(k) != new.get(k)}
+
+def changedRegions(oldMap, newMap):
+   # (first, last) runs of addresses whose code/data flag flipped
+   candidates = set()
+   for start, end in oldMap.rawRanges + newMap.rawRanges:
+      candidates.update(range(start, end + 1))
+
+   regions = []
+   for address in sorted(candidates):
+      if (address in oldMap) != (address in newMap):
+         if regions and regions[-1][1] == address - 1:
+            regions[-1][1] = address
+         else:
+            regions.append([address, address])
+   return [tuple(r) for r in regions]
@@ -1,138 +1,241 @@
+import io
 import sys
-import yaml
 from instructions import *
-from collections import OrderedDict
 from pathlib import Path
-from utils import hexParse
-
-from argparse import ArgumentParser, ArgumentTypeError
-
-alli = Instruction.alli
-
-parser = ArgumentParser()
-parser.add_argument('-i', '--input', help='Input binary file', required=True, type=str)
-parser.add_argument('-a', '--addresses', help='show addresses for each line', action="store_true", default=False)
-parser.add_argument('-w', '--binaryops', help='Show opcodes w/ binary', action="store_true", default=False)
-args = parser.parse_args()
-
-program = OrderedDict()
-
-sym_path = Path(f"{args.input}.yml")
-if sym_path.is_file():
-   with open(sym_path) as file: 
-      yml = yaml.safe_load(file)
-
-   if 'addresses' in yml:
-      for i in yml['addresses']:
-         addrInt = hexParse(yml['addresses'][i])
-         Instruction.syms[addrInt] = i
-         print(f"{i} EQU {hex(addrInt)}")
-
-   if 'labels' in yml:
-      for i in yml['labels']:
-         addrInt = hexParse(yml['labels'][i])
-         Instruction.labels[addrInt] = i
-
-   if 'inPorts' in yml:
-      print("\n; INPUT PORTS")
-      for i in yml['inPorts']:
-         portInt = hexParse(yml['inPorts'][i])
-         Instruction.inPorts[portInt] = i
-         print(f"{i} EQU {hex(portInt)}")
-
-   if 'outPorts' in yml:
-      print("\n; OUTPUT PORTS")
-      for i in yml['outPorts']:
-         portInt = hexParse(yml['outPorts'][i])
-         Instruction.outPorts[portInt] = i
-         print(f"{i} EQU {hex(portInt)}")
-
-   if 'notes' in yml:
-      for i in yml['notes']:
-         addr = hexParse(i)
-         Instruction.notes[addr] = yml['notes'][i]
-
-   if 'not_code' in yml:
-      for i in yml['not_code']:
-         label = i
-         start = hexParse(yml['not_code'][i][0])
-         end = hexParse(yml['not_code'][i][1])
-         Instruction.addDataRange((start, end))
-
-PC = 0
-Instruction.opcodeBinary = args.binaryops
-
-with open(args.input, mode='rb') as file: # b is important -> binary
-    while (byte := file.read(1)):
-
-      instr = alli[int.from_bytes(byte)]
-      nextPC = PC + 1
-
-      if not Instruction.checkIfData(PC):
-         operand1 = None
-         operand2 = None
-
-         if instr.numOperands >= 1:
-            operand1 = int.from_bytes(file.read(1))
-            nextPC = nextPC + 1
-    
-         if instr.numOperands == 2:
-            operand2 = int.from_bytes(file.read(1))
-            nextPC = nextPC + 1
-
-         instance = instr.instantiate(operand1, operand2)
-         program[Address(PC)] = instance
+from utils import hexParse, loadImage
+from session import DisassemblySession
+from symfile import readSymbols, compiledTables
+from stats import noStats
+from decode import linearSweep, flowSweep
+from emitter import Emitter
+
+def symbolPath(inputPath):
+   return Path(f"{inputPath}.yml")
+
+def makeSession(symbols = None, addresses = False, binaryops = False, flow = False, entries = (), compiled = False, resolve = False, cycles = False, emulate = None):
+   # symbols may be a path to a .yml or an already parsed dict, compiled
+   # means the .ymlc sidecar, or a dict of tables from it
+   session = DisassemblySession(addresses, binaryops, flow, resolve, cycles, emulate)
+   if isinstance(symbols, dict):
+      if compiled:
+         session.applyTables(symbols)
       else:
-         instance = instr.instantiateDB()
-         program[Address(PC)] = instance
-      PC = nextPC
-
-# pass to eliminate junk jumps / calls
-for addr in program:
-   line = program[addr]
-
-# see $0445 why
-#   if line.insType == InstrType.BRANCH:
-#      if line.operandType == OperandType.ADDRESS:
-#         if line.targetAddress not in program:
-#            if not Instruction.checkIfData(addr.address):
-#            #print(f"; BOGUS address {line.targetAddress} found in {line} at {addr}")
-#               line.junk()
-
-for addr in program:
-   line = program[addr]
-   line.address = addr
-
-   # walk through all jumps and calls
-   if line.insType == InstrType.BRANCH:
-      if line.operandType == OperandType.ADDRESS:
-         #  no label for it? make one, 
-         label = Label.makeLabel(line.targetAddress)
-
-         # find the instruction that is called
-         if line.targetAddress in program:
-            target = program[line.targetAddress]
-
-            # label the target
-            target.label = label
-            line.targetLabel = label
-
-            # label the line
-            line.label = Label.makeLabel(line.address)
-            line.label.setOrigin()
-            label.addCaller(line)
-
-for pc in program:
-   if pc.address in Instruction.notes:
-      print(f"; {Instruction.notes[pc.address]}")
-   if args.addresses:
-      l = program[pc]
-      if l.label and l.label.isCall:
-         print(" ")
-      print(f"{pc} {l}")
+         session.applySymbols(symbols)
+   elif symbols is not None:
+      session.loadSymbols(symbols, compiled)
+   session.entries.extend(hexParse(e) if isinstance(e, str) else e for e in entries)
+   return session
+
+def asImage(buffer):
+   if isinstance(buffer, memoryview):
+      return buffer
+   return memoryview(buffer)
+
+def disassemble(buffer, symbols = None, flow = False, entries = (), start = 0, session = None):
+   # lazily yields decoded instructions in address order, no label pass.
+   # the linear sweep decodes one instruction per next(), so stopping early
+   # costs nothing; flow mode has to find all reachable code first.
+   if session is None:
+      session = makeSession(symbols, flow = flow, entries = entries)
+   image = asImage(buffer)
+
+   if session.flow:
+      decoder = flowSweep(image, session, session.entries)
    else:
-      print(f"{program[pc]}")
-
-
+      decoder = linearSweep(image, session, start)
+
+   for PC, instance in decoder:
+      instance.address = PC
+      yield instance
+
+def disassembleProgram(buffer, symbols = None, flow = False, entries = (), session = None, cache = None, imageHash = None, resolve = False, jobs = 1, stats = None):
+   # whole image decoded and labelled, returns (session, program)
+   stats = stats or noStats
+   if session is None:
+      session = makeSession(symbols, flow = flow, entries = entries, resolve = resolve)
+   program = session.decode(asImage(buffer), cache, imageHash, jobs, stats)
+
+   # pass to eliminate junk jumps / calls
+   for addr in program:
+      line = program[addr]
+
+   # see $0445 why
+   #   if line.insType == InstrType.BRANCH:
+   #      if line.operandType == OperandType.ADDRESS:
+   #         if line.targetAddress not in program:
+   #            if not session.checkIfData(addr):
+   #            #print(f"; BOGUS address {line.targetAddress} found in {line} at {addr}")
+   #               line.junk()
+
+   with stats.phase('link'):
+      session.link(program)
+   return session, program
+
+def disassembleFile(inputPath, output = None, addresses = False, binaryops = False, flow = False, entry = (), cache = None, xref = None, stats = None, compiled = False, jobs = 1, resolve = False, cfg = None, cycles = False, emulate = None, histogram = None):
+   stats = stats or noStats
+   symPath = symbolPath(inputPath)
+   with stats.phase('load'):
+      image = loadImage(inputPath)
+   symbols = None
+   if symPath.is_file():
+      with stats.phase('yaml'):
+         symbols = compiledTables(symPath) if compiled else readSymbols(symPath)
+   with stats.phase('symbols'):
+      session = makeSession(symbols, addresses, binaryops, flow, entry, compiled, resolve, cycles, emulate)
+
+   text = None
+   program = None
+   if cache is not None and xref is None and cfg is None and histogram is None:
+      # unchanged binary + symbols: reuse the listing, skip decoding entirely
+      with stats.phase('cache'):
+         imageHash = session.imageHash(image)
+         renderKey = session.renderKey(imageHash)
+         text = cache.get('asm', renderKey)
+         if text is not None:
+            text = text.decode()
+   else:
+      imageHash = None
+
+   if text is None:
+      session, program = disassembleProgram(image, session = session, cache = cache, imageHash = imageHash, jobs = jobs, stats = stats)
+      with stats.phase('render'):
+         buffer = io.StringIO()
+         with Emitter(buffer) as out:
+            session.render(program, out)
+         text = buffer.getvalue()
+      if cache is not None and xref is None and cfg is None and histogram is None:
+         cache.put('asm', renderKey, text.encode())
+
+   with stats.phase('write'):
+      with Emitter(output) as out:
+         out.file.write(text)
+   if xref is not None:
+      session.xref.export(xref)
+   if cfg is not None:
+      from cfg import ControlFlowGraph
+      with stats.phase('cfg'):
+         ControlFlowGraph(program, session).export(cfg)
+   if histogram is not None and session.trace is not None:
+      session.trace.export(histogram, session)
+
+   stats.collect(session, image, program)
+   return session, image, program
+
+def portValue(text):
+   # NAME=VALUE for --in
+   name, sep, value = text.partition('=')
+   if not sep:
+      raise ValueError(text)
+   return name, hexParse(value)
+
+def interruptPeriod(text):
+   # VECTOR:PERIOD for --irq
+   vector, sep, period = text.partition(':')
+   if not sep or int(period) < 1:
+      raise ValueError(text)
+   return hexParse(vector), int(period)
+
+def emulateSettings(args):
+   if args.emulate is None:
+      return None
+   return {'cycles' : args.emulate, 'inputs' : dict(args.inputs), 'interrupts' : args.interrupts}
+
+def checkInputs(parser, args):
+   # --in names against the .yml's inPorts now, not as a traceback halfway through decoding
+   names = []
+   for name, value in args.inputs:
+      try:
+         hexParse(name)
+      except ValueError:
+         names.append(name)
+   if not names:
+      return
+   symPath = symbolPath(args.input)
+   session = makeSession(symPath if symPath.is_file() else None, compiled = args.compiled_symbols)
+   for name in names:
+      if name not in session.inPorts.values():
+         known = ", ".join(session.inPorts.values()) or "none"
+         parser.error(f"--in: {name} is not an inPorts name in {symPath} (known: {known})")
+
+def argParser():
+   from argparse import ArgumentParser
+   parser = ArgumentParser()
+   parser.add_argument('-i', '--input', help='Input binary file', required=True, type=str)
+   parser.add_argument('-a', '--addresses', help='show addresses for each line', action="store_true", default=False)
+   parser.add_argument('-w', '--binaryops', help='Show opcodes w/ binary', action="store_true", default=False)
+   parser.add_argument('-f', '--flow', help='follow control flow from the entry points, everything unreached is data', action="store_true", default=False)
+   parser.add_argument('-e', '--entry', help='extra entry point for --flow, may be repeated', action="append", default=[], type=hexParse)
+   parser.add_argument('-o', '--output', help='write the listing to a file instead of stdout', type=str)
+   parser.add_argument('--cache', help="reuse decoded/rendered results from a cache directory (default ~/.cache/matdasm)", nargs='?', const='', type=str)
+   parser.add_argument('--cache-size', help='cache size limit in MB', default=256, type=int)
+   parser.add_argument('-x', '--xref', help='export callers/callees/readers/writers to a .json or .csv file', type=str)
+   parser.add_argument('--cfg', help='export basic blocks and control flow edges to a .dot or .json file', type=str)
+   parser.add_argument('--watch', help='stay running and rewrite --output whenever the .bin or .yml changes', action="store_true", default=False)
+   parser.add_argument('--debounce', help='seconds to wait for saves to settle in --watch', default=0.3, type=float)
+   parser.add_argument('-c', '--compiled-symbols', help='load symbols through a compiled .ymlc next to the .yml, rebuilt when the .yml changes', action="store_true", default=False)
+   parser.add_argument('-r', '--resolve', help='find RST, PCHL and jump table targets by constant propagation and label / decode them', action="store_true", default=False)
+   parser.add_argument('-t', '--cycles', help='annotate the listing with 8085 T-states per instruction and cycle bounds per block, loop and subroutine', action="store_true", default=False)
+   parser.add_argument('--emulate', help='run the ROM for this many T-states first, everything it executes is code', type=int)
+   parser.add_argument('--in', help='with --emulate, what IN from a port reads: NAME=VALUE, NAME an inPorts name or a port number, may be repeated', dest='inputs', action="append", default=[], type=portValue)
+   parser.add_argument('--irq', help='with --emulate, raise an interrupt: VECTOR:PERIOD in T-states, may be repeated', dest='interrupts', action="append", default=[], type=interruptPeriod)
+   parser.add_argument('--histogram', help='with --emulate, export executions per address to a .json or .csv file', type=str)
+   parser.add_argument('-j', '--jobs', help='decode in this many worker processes (linear sweep only)', default=1, type=int)
+   parser.add_argument('--stats', help='report phase timings and counters on stderr, or to a .json file', nargs='?', const='', type=str)
+   parser.add_argument('--profile', help='write cProfile data for the run to a file (implies --stats)', type=str)
+   return parser
+
+def main(argv = None):
+   argv = sys.argv[1:] if argv is None else argv
+   if argv[:1] == ['diff']:
+      # matdasm diff old.bin new.bin, see diff.py
+      from diff import main as diffMain
+      return diffMain(argv[1:])
+
+   parser = argParser()
+   args = parser.parse_args(argv)
+
+   checkInputs(parser, args)
+   cache = None
+   if args.cache is not None:
+      from cache import Cache
+      cache = Cache(args.cache or None, args.cache_size << 20)
+
+   if args.watch:
+      if not args.output:
+         parser.error("--watch needs -o/--output")
+      if args.stats is not None or args.profile is not None:
+         parser.error("--watch can't report --stats / --profile")
+      rebuild = None
+      if args.resolve or args.cycles or args.emulate is not None or args.xref or args.cfg or args.histogram or args.compiled_symbols or cache is not None:
+         # nothing incremental about these, every change is a whole run
+         rebuild = lambda: disassembleFile(args.input, args.output, args.addresses, args.binaryops, args.flow, args.entry, cache, args.xref, compiled = args.compiled_symbols, jobs = args.jobs, resolve = args.resolve, cfg = args.cfg, cycles = args.cycles, emulate = emulateSettings(args), histogram = args.histogram)
+      from watch import watch
+      try:
+         watch(args.input, args.output, args.addresses, args.binaryops, args.flow, args.entry, debounce = args.debounce, rebuild = rebuild)
+      except KeyboardInterrupt:
+         pass
+      return
+
+   if args.stats is None and args.profile is None:
+      disassembleFile(args.input, args.output, args.addresses, args.binaryops, args.flow, args.entry, cache, args.xref, compiled = args.compiled_symbols, jobs = args.jobs, resolve = args.resolve, cfg = args.cfg, cycles = args.cycles, emulate = emulateSettings(args), histogram = args.histogram)
+      return
+
+   from stats import PhaseStats
+   # tracemalloc slows every phase down, only the profiling run pays for it
+   stats = PhaseStats(memory = args.profile is not None)
+   run = lambda: disassembleFile(args.input, args.output, args.addresses, args.binaryops, args.flow, args.entry, cache, args.xref, stats, args.compiled_symbols, args.jobs, args.resolve, args.cfg, args.cycles, emulateSettings(args), args.histogram)
+   if args.profile:
+      import cProfile
+      profiler = cProfile.Profile()
+      profiler.runcall(run)
+      profiler.dump_stats(args.profile)
+   else:
+      run()
 
+   if args.stats:
+      stats.export(args.stats)
+   else:
+      stats.report()
 
+if __name__ == '__main__':
+   sys.exit(main())
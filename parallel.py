@@ -0,0 +1,100 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from instructions import opcodeTable
+from decode import unpackProgram
+
+# linear sweep split over worker processes. the ROM and the data map sit in
+# one shared memory block, each worker decodes its chunk from the three
+# offsets the sequential sweep could enter it at (an instruction is at most
+# three bytes), and the parent picks the run that matches the alignment the
+# previous chunk ended on. the result is the same kinds string packProgram
+# makes, 1 for an instruction start and 2 for a DB byte.
+
+# below this a chunk isn't worth a task
+minChunk = 0x1000
+
+def chunkBounds(size, jobs):
+   count = max(1, min(jobs * 4, size // minChunk))
+   step = -(-size // count)
+   return [(a, min(a + step, size)) for a in range(0, size, step)]
+
+def sweepRun(image, bits, start, stop, end, first = None):
+   # decode from start until the first instruction at or past stop, or until
+   # landing on a start the first run (a, kinds) found. returns (kinds, PC, joined)
+   kinds = bytearray()
+   PC = start
+   while PC < stop:
+      if first is not None and PC - first[0] < len(first[1]) and first[1][PC - first[0]]:
+         return kinds, PC, True
+      if bits[PC]:
+         kinds.append(2)
+         PC = PC + 1
+         continue
+      numOperands = opcodeTable[image[PC]].numOperands
+      if PC + numOperands >= end:
+         # operands run off the end of the image, dump what's left as data
+         kinds.extend(b'\x02' * (end - PC))
+         return kinds, end, False
+      kinds.append(1)
+      kinds.extend(bytes(numOperands))
+      PC = PC + 1 + numOperands
+   return kinds, PC, False
+
+def decodeChunk(name, size, a, b):
+   block = shared_memory.SharedMemory(name=name)
+   try:
+      image = block.buf[:size]
+      bits = block.buf[size:2 * size]
+      first = sweepRun(image, bits, a, b, size)
+      runs = [first]
+      for start in (a + 1, a + 2):
+         if start >= min(b, size):
+            runs.append(None)
+            continue
+         # the shifted runs usually fall back in step with the first within a few bytes
+         runs.append(sweepRun(image, bits, start, b, size, (a, first[0])))
+      del image, bits
+      return [None if run is None else (bytes(run[0]), run[1], run[2]) for run in runs]
+   finally:
+      block.close()
+
+def reconcile(size, chunks, results, start = 0):
+   kinds = bytearray(size)
+   PC = start
+   for (a, b), runs in zip(chunks, results):
+      if PC >= b:
+         continue
+      first = runs[0]
+      run = runs[PC - a]
+      kinds[PC:PC + len(run[0])] = run[0]
+      if run[2]:
+         # joined the first run, take the rest of it from the join point
+         join = run[1]
+         kinds[join:a + len(first[0])] = first[0][join - a:]
+         run = first
+      PC = run[1]
+   return bytes(kinds)
+
+def parallelKinds(image, dataMap, jobs = None):
+   jobs = jobs or os.cpu_count() or 1
+   size = len(image)
+   chunks = chunkBounds(size, jobs)
+
+   block = shared_memory.SharedMemory(create=True, size=max(1, 2 * size))
+   try:
+      block.buf[:size] = image
+      mapped = min(size, len(dataMap.bits))
+      block.buf[size:size + mapped] = dataMap.bits[:mapped]
+      block.buf[size + mapped:2 * size] = bytes(size - mapped)
+      with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+         results = list(pool.map(decodeChunk, [block.name] * len(chunks), [size] * len(chunks), *zip(*chunks)))
+   finally:
+      block.close()
+      block.unlink()
+   return reconcile(size, chunks, results)
+
+def parallelDecode(image, session, jobs = None):
+   if not len(image):
+      return unpackProgram(image, b'', session)
+   return unpackProgram(image, parallelKinds(image, session.dataMap, jobs), session)
@@ -0,0 +1,325 @@
+from instructions import *
+from decode import resync
+
+# targets the label pass can't see: RST n is a call to n*8, PCHL jumps to
+# whatever HL holds. one pass over the program in address order tracks the
+# 8 bit registers through straight line code, resetting at every branch
+# target and after calls, so it stays linear in the program size.
+#
+# a register is an int when known, ('t', base, offset) when it was loaded
+# from a word table at base indexed by something unknown, or None. H and L
+# both hold ('p', base, offset) while HL points into such a table.
+
+B, C, D, E, H, L, M, A = range(8)
+
+# jumps through a table stop at this many entries
+maxTableEntries = 128
+
+# the opcodes not handled one by one below that write a register, all of them write only A:
+# ADD .. ORA, the immediate ALU ops bar CPI, rotates, DAA, CMA, RIM and IN
+writesA = frozenset(range(0x80, 0xb8)) | frozenset((0xc6, 0xce, 0xd6, 0xde, 0xe6, 0xee, 0xf6,
+                                                   0x07, 0x0f, 0x17, 0x1f, 0x27, 0x2f, 0x20, 0xdb))
+
+def restartTarget(op):
+   if op.opcode == 0xcb:
+      # RSTV, restart at 0x40 on overflow
+      return 0x40
+   if op.insType == InstrType.BRANCH and op.mnemonic.startswith("RST"):
+      return op.opcode & 0x38
+   return None
+
+def pairValue(regs, hi):
+   h = regs[hi]
+   l = regs[hi + 1]
+   if type(h) is int and type(l) is int:
+      return (h << 8) | l
+   return None
+
+def setPair(regs, hi, value):
+   if value is None:
+      regs[hi] = regs[hi + 1] = None
+   else:
+      regs[hi] = (value >> 8) & 0xff
+      regs[hi + 1] = value & 0xff
+
+def pointer(regs):
+   h = regs[H]
+   if type(h) is tuple and h[0] == 'p' and regs[L] is h:
+      return h
+   return None
+
+def readByte(image, address):
+   if address is not None and address < len(image):
+      return image[address]
+   return None
+
+def load(regs, image):
+   # MOV r,M / LDAX: a ROM byte for a known address, a table byte for a table pointer
+   p = pointer(regs)
+   if p is not None:
+      return ('t', p[1], p[2])
+   return readByte(image, pairValue(regs, H))
+
+class Resolution:
+   def __init__(self):
+      # (PC, target, kind) with kind 'call' or 'jump', in address order
+      self.refs = []
+      # (base, end, PC of the PCHL) for every jump table, end inclusive
+      self.tables = []
+
+   def targets(self):
+      return {target for PC, target, kind in self.refs}
+
+def scan(program, image, session, known = ()):
+   result = Resolution()
+
+   # straight line code ends wherever something can branch in
+   starts = set(session.entries)
+   starts.update(known)
+   for PC in program:
+      line = program[PC]
+      if line.targetAddress is not None and line.insType == InstrType.BRANCH:
+         starts.add(line.targetAddress)
+
+   # operand bytes of straight line code from a start: no jump lands there
+   operands = bytearray(len(image))
+   aligned = False
+   regs = [None] * 8
+   for PC in program:
+      line = program[PC]
+      op = line.op
+      if PC in starts:
+         regs = [None] * 8
+         aligned = True
+      if op.insType == InstrType.JUNK:
+         regs = [None] * 8
+         aligned = False
+         continue
+      if aligned:
+         operands[PC + 1:PC + 1 + op.numOperands] = b'\x01' * op.numOperands
+
+      code = op.opcode
+      operand1 = line.operand1
+      operand2 = line.operand2
+
+      if code & 0xc7 == 0x06 and code != 0x36:
+         # MVI r,n
+         regs[(code >> 3) & 7] = operand1
+      elif 0x40 <= code <= 0x7f and code != 0x76:
+         # MOV d,s
+         dst = (code >> 3) & 7
+         src = code & 7
+         if dst != M:
+            if src == M:
+               regs[dst] = load(regs, image)
+            else:
+               regs[dst] = regs[src]
+            if dst in (H, L):
+               pointerBroken(regs, dst)
+      elif code in (0x01, 0x11, 0x21):
+         # LXI
+         setPair(regs, (code >> 3) & 6, (operand2 << 8) | operand1)
+      elif code in (0x03, 0x13, 0x23, 0x0b, 0x1b, 0x2b):
+         # INX / DCX
+         hi = (code >> 3) & 6
+         step = 1 if code & 0x08 == 0 else -1
+         p = pointer(regs) if hi == H else None
+         if p is not None:
+            regs[H] = regs[L] = ('p', p[1], p[2] + step)
+         else:
+            value = pairValue(regs, hi)
+            setPair(regs, hi, None if value is None else (value + step) & 0xffff)
+      elif code & 0xc7 in (0x04, 0x05) and code not in (0x34, 0x35):
+         # INR / DCR
+         r = (code >> 3) & 7
+         value = regs[r]
+         regs[r] = (value + (1 if code & 1 == 0 else -1)) & 0xff if type(value) is int else None
+         if r in (H, L):
+            pointerBroken(regs, r)
+      elif code in (0x09, 0x19, 0x29):
+         # DAD: a known base plus an unknown index is a table pointer
+         hl = pairValue(regs, H)
+         other = hl if code == 0x29 else pairValue(regs, (code >> 3) & 6)
+         if hl is not None and other is not None:
+            setPair(regs, H, (hl + other) & 0xffff)
+         elif code != 0x29 and (hl is None) != (other is None) and pointer(regs) is None:
+            regs[H] = regs[L] = ('p', hl if hl is not None else other, 0)
+         else:
+            setPair(regs, H, None)
+      elif code == 0xeb:
+         # XCHG
+         regs[D], regs[E], regs[H], regs[L] = regs[H], regs[L], regs[D], regs[E]
+      elif code == 0x2a:
+         # LHLD from ROM
+         address = (operand2 << 8) | operand1
+         regs[L] = readByte(image, address)
+         regs[H] = readByte(image, address + 1)
+      elif code == 0x3a:
+         regs[A] = readByte(image, (operand2 << 8) | operand1)
+      elif code in (0x0a, 0x1a):
+         # LDAX B / D
+         regs[A] = readByte(image, pairValue(regs, (code >> 3) & 6))
+      elif code in (0xc1, 0xd1, 0xe1, 0xf1):
+         # POP
+         if code == 0xf1:
+            regs[A] = None
+         else:
+            setPair(regs, (code >> 3) & 6, None)
+      elif code in (0xe3, 0x10, 0x08, 0x39):
+         # XTHL, ARHL, DSUB, DAD SP
+         setPair(regs, H, None)
+      elif code == 0x18:
+         # RDEL
+         setPair(regs, D, None)
+      elif code in (0x28, 0x38):
+         # LDHI / LDSI
+         hl = pairValue(regs, H) if code == 0x28 else None
+         setPair(regs, D, None if hl is None else (hl + operand1) & 0xffff)
+      elif code == 0xed:
+         # LHLX, HL from the word DE points at
+         address = pairValue(regs, D)
+         regs[L] = readByte(image, address)
+         regs[H] = readByte(image, None if address is None else address + 1)
+      elif code == 0xe9:
+         jumpThrough(result, regs, PC)
+      elif code in writesA:
+         regs[A] = None
+
+      if op.insType == InstrType.BRANCH:
+         target = restartTarget(op)
+         if target is not None:
+            result.refs.append((PC, target, 'call'))
+         if op.branchType in (BranchType.CALL, BranchType.RESTART) or target is not None:
+            # the callee may leave anything in the registers
+            regs = [None] * 8
+         elif code in (0xc3, 0xc9, 0xe9):
+            regs = [None] * 8
+      if code in (0xc3, 0xc9, 0xe9):
+         aligned = False
+
+   readTables(result, image, operands)
+   return result
+
+def pointerBroken(regs, r):
+   # writing half of a table pointer leaves an unknown address
+   other = L if r == H else H
+   if type(regs[other]) is tuple and regs[other][0] == 'p':
+      regs[other] = None
+   if type(regs[r]) is tuple and regs[r][0] == 'p':
+      regs[r] = None
+
+def jumpThrough(result, regs, PC):
+   target = pairValue(regs, H)
+   if target is not None:
+      result.refs.append((PC, target, 'jump'))
+      return
+   h = regs[H]
+   l = regs[L]
+   # the low byte from table[i], the high byte from table[i+1]
+   if type(h) is tuple and type(l) is tuple and h[0] == l[0] == 't' and h[1] == l[1] and h[2] == l[2] + 1:
+      result.tables.append((h[1] + l[2], None, PC))
+
+def readTables(result, image, operands):
+   # a table ends where the next one starts, or where it runs into code
+   # that any table or PCHL jumps to
+   bases = sorted({base for base, last, PC in result.tables})
+   found = []
+   for base, last, PC in result.tables:
+      i = bases.index(base)
+      limit = bases[i + 1] if i + 1 < len(bases) else len(image)
+      found.append((base, PC, tableTargets(image, base, limit, operands)))
+
+   code = {target for PC, target, kind in result.refs}
+   for base, PC, targets in found:
+      code.update(targets)
+
+   result.tables = []
+   for base, PC, targets in found:
+      for i in range(len(targets)):
+         if base + 2 * i in code:
+            targets = targets[:i]
+            break
+      if targets:
+         result.tables.append((base, base + 2 * len(targets) - 1, PC))
+         result.refs.extend((PC, target, 'jump') for target in targets)
+   result.refs.sort(key=lambda ref: ref[0])
+
+def tableTargets(image, base, limit, operands):
+   # little endian words until one can't be a code address in this image,
+   # points back into the table, lands in the operands of known straight
+   # line code or of an earlier entry's instruction, or looks like padding:
+   # zero, or a run of one fill byte
+   end = len(image)
+   targets = []
+   covered = set()
+   address = base
+   while address + 1 < min(limit, end) and len(targets) < maxTableEntries:
+      target = image[address] | (image[address + 1] << 8)
+      if target >= end or base <= target <= address + 1 or target == 0:
+         break
+      if image[address] == image[address + 1] and address + 3 < end and image[address + 2:address + 4] == image[address:address + 2]:
+         break
+      if operands[target] or target in covered:
+         break
+      targets.append(target)
+      covered.update(range(target + 1, target + 1 + opcodeTable[image[target]].numOperands))
+      address = address + 2
+   return targets
+
+def resolveIndirect(program, image, session, rounds = 8):
+   # scan, turn what was found into data ranges, entries and resync points,
+   # decode again, until a scan finds nothing new. returns (program, resolution)
+   forced = set()
+   for i in range(rounds):
+      result = scan(program, image, session, forced)
+      changed = False
+
+      ranges = []
+      for base, last, PC in result.tables:
+         ranges.append((base, last))
+         if any(program.startOf(a) != a or program[a].insType != InstrType.JUNK for a in range(base, last + 1)):
+            changed = True
+      session.addDataRanges(ranges)
+
+      for PC, target, kind in result.refs:
+         if target >= len(image) or target in session.dataMap:
+            continue
+         forced.add(target)
+         if session.flow and target not in session.entries:
+            session.entries.append(target)
+         if program.startOf(target) != target or program[target].insType == InstrType.JUNK:
+            changed = True
+
+      if not changed:
+         return program, result
+      program = session.sweepProgram(image)
+      if not session.flow:
+         for target in sorted(forced):
+            if target not in session.dataMap:
+               resync(program, image, session, target)
+   return program, scan(program, image, session, forced)
+
+def labelIndirect(program, session, result, xref = None):
+   # the label pass for resolved targets, like a jump / call at the RST or PCHL
+   seen = set()
+   for PC, target, kind in result.refs:
+      if (PC, target) in seen:
+         continue
+      seen.add((PC, target))
+      if xref is not None:
+         xref.addIndirect(PC, target, kind)
+      if target not in program or PC not in program:
+         continue
+      if program[target].insType == InstrType.JUNK or session.checkIfData(target):
+         # data, not an entry point, as flowSweep would have it
+         continue
+      line = program[PC]
+      label = session.makeLabel(target)
+      program[target].label = label
+      line.label = session.makeLabel(PC)
+      line.label.setOrigin()
+      label.jumpers.append(line)
+      if kind == 'call':
+         label.isCall = True
+      else:
+         label.isJump = True
@@ -0,0 +1,257 @@
+from instructions import DataMap, Label, addrStr
+from utils import hexParse
+from decode import Program, accelerated, linearSweep, flowSweep, linkLabels, packProgram, unpackProgram, vectorEntries
+from xref import XrefIndex
+from symfile import readSymbols, compiledTables
+from stats import noStats
+
+def symbolValue(section, name, word):
+   # name the offending entry, a bare "not a number" is useless in a big .yml
+   try:
+      return hexParse(word)
+   except ValueError as e:
+      raise ValueError(f"{section}: {name}: {e}") from None
+
+# everything one disassembly needs: symbols, data map, labels and output options.
+# sessions share nothing, so any number of them can run side by side.
+class DisassemblySession:
+   def __init__(self, addresses = False, binaryops = False, flow = False, resolve = False, cycles = False, emulate = None):
+      self.addresses = addresses
+      self.binaryops = binaryops
+      self.flow = flow
+      self.resolve = resolve
+      self.cycles = cycles
+      # {'cycles', 'inputs', 'interrupts'} to run the ROM first, see emulate.py
+      self.emulate = emulate
+
+      self.syms = {}
+      self.labelNames = {}
+      self.inPorts = {}
+      self.outPorts = {}
+      self.notes = {}
+      self.dataMap = DataMap()
+      self.entries = list(vectorEntries)
+
+      # address -> Label, filled in by the label pass
+      self.labels = {}
+      # cross references, built with the labels
+      self.xref = None
+      # fast.py when decode picked the numpy backend
+      self.backend = None
+      # RST / PCHL / jump table targets when resolving, see resolve.py
+      self.resolution = None
+      # (inline, notes) T-state comments for the listing, see cycles.py
+      self.cycleNotes = None
+      # what the emulator ran when emulating, see emulate.py
+      self.trace = None
+      # EQU lines for the top of the listing
+      self.header = []
+      # every symbol dict applied, in order, for cache keys
+      self.symbolSources = []
+      # name -> value per group of tables, built on first lookup
+      self.nameIndexes = {}
+
+   def loadSymbols(self, symPath, compiled = False):
+      if compiled:
+         self.applyTables(compiledTables(symPath))
+      else:
+         self.applySymbols(readSymbols(symPath))
+
+   def applySymbols(self, yml):
+      if not yml:
+         return
+      self.symbolSources.append(yml)
+      self.nameIndexes = {}
+
+      if 'addresses' in yml:
+         for i in yml['addresses']:
+            addrInt = symbolValue('addresses', i, yml['addresses'][i])
+            self.syms[addrInt] = i
+            self.header.append(f"{i} EQU {hex(addrInt)}")
+
+      if 'labels' in yml:
+         for i in yml['labels']:
+            addrInt = symbolValue('labels', i, yml['labels'][i])
+            self.labelNames[addrInt] = i
+
+      if 'inPorts' in yml:
+         self.header.append("\n; INPUT PORTS")
+         for i in yml['inPorts']:
+            portInt = symbolValue('inPorts', i, yml['inPorts'][i])
+            self.inPorts[portInt] = i
+            self.header.append(f"{i} EQU {hex(portInt)}")
+
+      if 'outPorts' in yml:
+         self.header.append("\n; OUTPUT PORTS")
+         for i in yml['outPorts']:
+            portInt = symbolValue('outPorts', i, yml['outPorts'][i])
+            self.outPorts[portInt] = i
+            self.header.append(f"{i} EQU {hex(portInt)}")
+
+      if 'notes' in yml:
+         for i in yml['notes']:
+            addr = symbolValue('notes', i, i)
+            self.notes[addr] = yml['notes'][i]
+
+      if 'not_code' in yml:
+         ranges = []
+         for i in yml['not_code']:
+            start = symbolValue('not_code', i, yml['not_code'][i][0])
+            end = symbolValue('not_code', i, yml['not_code'][i][1])
+            ranges.append((start, end))
+         self.addDataRanges(ranges)
+
+      if 'entries' in yml:
+         for i in yml['entries']:
+            self.entries.append(symbolValue('entries', i, i))
+
+   def tables(self):
+      # what applySymbols built, in a json friendly shape for symfile
+      return {
+         'syms' : list(self.syms.items()),
+         'labelNames' : list(self.labelNames.items()),
+         'inPorts' : list(self.inPorts.items()),
+         'outPorts' : list(self.outPorts.items()),
+         'notes' : list(self.notes.items()),
+         'ranges' : self.dataMap.ranges(),
+         'entries' : self.entries[len(vectorEntries):],
+         'header' : self.header,
+      }
+
+   def applyTables(self, tables):
+      # the compiled counterpart of applySymbols, no parsing left to do
+      self.symbolSources.append(tables)
+      self.nameIndexes = {}
+      self.syms.update(tables['syms'])
+      self.labelNames.update(tables['labelNames'])
+      self.inPorts.update(tables['inPorts'])
+      self.outPorts.update(tables['outPorts'])
+      self.notes.update(tables['notes'])
+      self.addDataRanges(tables['ranges'])
+      self.entries.extend(tables['entries'])
+      self.header.extend(tables['header'])
+
+   def lookup(self, nameOrValue, tables = ('syms', 'labelNames')):
+      # an int, a name from these tables (the first one wins) or a hex literal
+      if isinstance(nameOrValue, int):
+         return nameOrValue
+      index = self.nameIndexes.get(tables)
+      if index is None:
+         index = {}
+         for table in reversed(tables):
+            for value, name in reversed(list(getattr(self, table).items())):
+               index[name] = value
+         self.nameIndexes[tables] = index
+      if nameOrValue in index:
+         return index[nameOrValue]
+      try:
+         return hexParse(nameOrValue)
+      except ValueError:
+         raise KeyError(f"unknown symbol {nameOrValue}") from None
+
+   def checkIfData(self, check):
+      return check in self.dataMap
+
+   def addDataRange(self, dbRange):
+      self.dataMap.add(dbRange)
+
+   def addDataRanges(self, dbRanges):
+      self.dataMap.addMany(dbRanges)
+
+   def makeLabel(self, address):
+      label = self.labels.get(address)
+      if label is None:
+         label = Label(address, self)
+         self.labels[address] = label
+      return label
+
+   def addrStr(self, address):
+      return addrStr(address, self.syms)
+
+   def imageHash(self, image):
+      from cache import digest
+      return digest(image)
+
+   def symbolKey(self):
+      # tables() with sorted keys: what the listing depends on, however the .yml spelled it
+      tables = self.tables()
+      for name in ('syms', 'labelNames', 'inPorts', 'outPorts', 'notes'):
+         tables[name] = sorted(tables[name])
+      return tables
+
+   def decodeKey(self, imageHash):
+      # everything the decoded program depends on besides the opcode table
+      from cache import digest, cacheVersion
+      # emulated --in names resolve through inPorts
+      ports = sorted(self.inPorts.items()) if self.emulate else None
+      return digest(cacheVersion, imageHash, self.flow, self.resolve, self.emulate, ports, self.entries, self.dataMap.ranges())
+
+   def renderKey(self, imageHash):
+      from cache import digest, cacheVersion
+      return digest(cacheVersion, imageHash, self.symbolKey(), self.addresses, self.binaryops, self.flow, self.resolve, self.cycles, self.emulate, self.entries)
+
+   def decode(self, image, cache = None, imageHash = None, jobs = 1, stats = noStats):
+      with stats.phase('decode'):
+         self.backend = accelerated(len(image))
+         program = None
+         if cache is not None:
+            key = self.decodeKey(imageHash or self.imageHash(image))
+            kinds = cache.getObject('decode', key)
+            if kinds is not None and len(kinds) == len(image):
+               program = unpackProgram(image, kinds, self)
+
+         fresh = program is None
+         if fresh:
+            program = self.sweepProgram(image, jobs)
+      if self.resolve:
+         # cheap on a cached program: one scan that finds nothing new to decode
+         from resolve import resolveIndirect
+         with stats.phase('resolve'):
+            program, self.resolution = resolveIndirect(program, image, self)
+      if self.emulate:
+         # run on a cached program too, confirming code finds nothing new there
+         from emulate import emulate, confirmCode
+         settings = self.emulate
+         with stats.phase('emulate'):
+            self.trace = emulate(image, self, settings['cycles'], settings.get('inputs'), interrupts = settings.get('interrupts', ()))
+            program = confirmCode(program, image, self, self.trace)
+      if fresh and cache is not None:
+         with stats.phase('cache'):
+            cache.putObject('decode', key, packProgram(program, len(image)))
+      return program
+
+   def sweepProgram(self, image, jobs = 1):
+      if self.flow:
+         program = Program(len(image))
+         for PC, instance in flowSweep(image, self, self.entries):
+            program.add(PC, instance)
+      elif jobs > 1:
+         from parallel import parallelDecode
+         program = parallelDecode(image, self, jobs)
+      elif self.backend is not None:
+         program = self.backend.decodeProgram(image, self)
+      else:
+         program = Program(len(image))
+         for PC, instance in linearSweep(image, self):
+            program.add(PC, instance)
+      return program
+
+   def link(self, program):
+      self.xref = XrefIndex(self)
+      if self.backend is not None:
+         self.backend.linkProgram(program, self, self.xref)
+      else:
+         linkLabels(program, self, self.xref)
+      if self.resolution is not None:
+         from resolve import labelIndirect
+         labelIndirect(program, self, self.resolution, self.xref)
+      if self.trace is not None:
+         from resolve import labelIndirect
+         labelIndirect(program, self, self.trace, self.xref)
+
+   def render(self, program, out):
+      if self.cycles:
+         from cycles import CycleCounts
+         self.cycleNotes = CycleCounts(program, self).annotations()
+      out.header(self)
+      out.program(program, self)
@@ -0,0 +1,127 @@
+import sys
+import time
+from instructions import InstrType
+
+# per phase wall time and live allocator block deltas for one disassembly,
+# and with memory on, tracemalloc's bytes per phase. everything goes to stderr
+# or a json file, never into the listing.
+class PhaseStats:
+   def __init__(self, memory = False):
+      self.phases = []
+      self.counters = {}
+      self.memory = memory
+      if memory:
+         import tracemalloc
+         tracemalloc.start()
+
+   def phase(self, name):
+      return Phase(self, name)
+
+   def seconds(self):
+      return sum(phase[1] for phase in self.phases)
+
+   def collect(self, session, image, program):
+      # counters derived from the finished run so the hot loops stay untouched
+      counters = self.counters
+      counters['bytes'] = len(image)
+      if program is not None:
+         data = sum(1 for PC, line in program.items() if line.insType == InstrType.JUNK)
+         counters['instructions'] = len(program) - data
+         counters['db'] = data
+      # probes of the live data map only, the numpy and parallel sweeps read the bitmap in bulk
+      counters['dataLookups'] = session.dataMap.lookups
+      counters['dataRanges'] = len(session.dataMap.ranges())
+      counters['dataBytes'] = session.dataMap.bits.count(1)
+      counters['labels'] = len(session.labels)
+      counters['labelNames'] = len(session.labelNames)
+      counters['symbols'] = len(session.syms)
+      if session.xref is not None:
+         counters['xrefs'] = len(session.xref.kinds)
+      if session.trace is not None:
+         counters['emulatedInstructions'] = session.trace.instructions
+         counters['emulatedCycles'] = session.trace.cycles
+         counters['executedAddresses'] = len(session.trace.starts())
+
+      # the sweep alone, resolve and emulate are phases of their own
+      decode = sum(phase[1] for phase in self.phases if phase[0] == 'decode')
+      if decode and 'instructions' in counters:
+         counters['instructionsPerSecond'] = round(len(program) / decode)
+         counters['bytesPerSecond'] = round(len(image) / decode)
+
+   def toDict(self):
+      return {
+         'phases' : [self.phaseDict(*phase) for phase in self.phases],
+         'total' : self.seconds(),
+         'counters' : self.counters,
+      }
+
+   def phaseDict(self, name, seconds, netBlocks, peak, held):
+      out = {'name' : name, 'seconds' : seconds, 'netBlocks' : netBlocks}
+      if self.memory:
+         out['peakBytes'] = peak
+         out['heldBytes'] = held
+      return out
+
+   def report(self, file = None):
+      file = file or sys.stderr
+      memory = f"{'peak KiB':>12}{'held KiB':>12}" if self.memory else ""
+      print(f"{'phase':<10}{'ms':>10}{'net blocks':>12}{memory}", file=file)
+      for name, seconds, netBlocks, peak, held in self.phases:
+         memory = f"{peak/1024:>12.1f}{held/1024:>+12.1f}" if self.memory else ""
+         print(f"{name:<10}{seconds*1000:>10.2f}{netBlocks:>+12}{memory}", file=file)
+      print(f"{'total':<10}{self.seconds()*1000:>10.2f}", file=file)
+      for name, value in self.counters.items():
+         print(f"{name:<22}{value:>12}", file=file)
+
+   def export(self, path):
+      import json
+      with open(path, 'w') as file:
+         json.dump(self.toDict(), file, indent=1)
+
+# netBlocks is how many more allocator blocks are live after the phase than
+# before it, negative when it freed more than it kept, cheap enough to leave on
+# for every run. with memory on, tracemalloc adds the bytes allocated at the
+# phase's high point (peak) and still held after it (held), both counted from
+# what was live when it started
+class Phase:
+   def __init__(self, stats, name):
+      self.stats = stats
+      self.name = name
+
+   def __enter__(self):
+      if self.stats.memory:
+         import tracemalloc
+         tracemalloc.reset_peak()
+         self.traced = tracemalloc.get_traced_memory()[0]
+      self.blocks = sys.getallocatedblocks()
+      self.start = time.perf_counter()
+      return self
+
+   def __exit__(self, *exc):
+      seconds = time.perf_counter() - self.start
+      netBlocks = sys.getallocatedblocks() - self.blocks
+      peak = held = None
+      if self.stats.memory:
+         import tracemalloc
+         current, highest = tracemalloc.get_traced_memory()
+         peak = highest - self.traced
+         held = current - self.traced
+      self.stats.phases.append((self.name, seconds, netBlocks, peak, held))
+
+# stand in when stats are off, phases cost one method call
+class NoStats:
+   def phase(self, name):
+      return noPhase
+
+   def collect(self, session, image, program):
+      pass
+
+class NoPhase:
+   def __enter__(self):
+      return self
+
+   def __exit__(self, *exc):
+      pass
+
+noPhase = NoPhase()
+noStats = NoStats()
@@ -0,0 +1,71 @@
+import os
+
+# bump when the compiled layout or applySymbols changes
+compiledVersion = 1
+
+def yamlLoader():
+   # libyaml's C loader when pyyaml was built with it, same results, much faster
+   import yaml
+   return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+def readSymbols(symPath):
+   import yaml
+   with open(symPath, 'rb') as file:
+      return yaml.load(file, Loader=yamlLoader())
+
+def compiledPath(symPath):
+   return f"{symPath}c"
+
+def stamp(symPath):
+   st = os.stat(symPath)
+   return [st.st_mtime_ns, st.st_size]
+
+# the .yml already converted to the session's tables: ints for every address,
+# merged data ranges, header lines. kept as json next to the .yml (foo.bin.ymlc)
+# and trusted while the .yml's mtime and size, or failing that its hash, match.
+def compiledTables(symPath):
+   import json
+   import hashlib
+   path = compiledPath(symPath)
+   current = stamp(symPath)
+   cached = None
+   try:
+      with open(path, 'rb') as file:
+         cached = json.load(file)
+      if cached.get('version') != compiledVersion:
+         cached = None
+   except (OSError, ValueError):
+      pass
+
+   if cached is not None and cached['stamp'] == current:
+      return cached['tables']
+
+   with open(symPath, 'rb') as file:
+      source = file.read()
+   sha = hashlib.sha256(source).hexdigest()
+   if cached is not None and cached['sha256'] == sha:
+      # touched but not edited, refresh the stamp so the next load skips the hash
+      tables = cached['tables']
+   else:
+      import yaml
+      tables = compileSymbols(yaml.load(source, Loader=yamlLoader()))
+
+   try:
+      saveCompiled(path, {'version' : compiledVersion, 'stamp' : current, 'sha256' : sha, 'tables' : tables})
+   except OSError:
+      # read only directory, just don't cache
+      pass
+   return tables
+
+def compileSymbols(yml):
+   from session import DisassemblySession
+   session = DisassemblySession()
+   session.applySymbols(yml)
+   return session.tables()
+
+def saveCompiled(path, compiled):
+   import json
+   tmp = f"{path}.tmp{os.getpid()}"
+   with open(tmp, 'w') as file:
+      json.dump(compiled, file, separators=(',', ':'))
+   os.replace(tmp, path)
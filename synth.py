@@ -0,0 +1,103 @@
+import random
+from instructions import *
+
+# synthetic 8085 images for benchmarks, each generator returns (image, symbols)
+# where symbols is a dict in the same shape as a parsed .bin.yml
+
+straightLine = tuple(op for op in opcodeTable if op.insType != InstrType.BRANCH and op.mnemonic != "HLT")
+branches = tuple(op for op in opcodeTable if op.operandType == OperandType.ADDRESS and op.insType == InstrType.BRANCH)
+returns = tuple(op for op in opcodeTable if op.branchType == BranchType.RETURN)
+
+def emit(out, rnd, op, target = None):
+   out.append(op.opcode)
+   if op.numOperands == 2 and target is not None:
+      out.extend((target & 0xff, target >> 8))
+   else:
+      out.extend(rnd.randrange(256) for i in range(op.numOperands))
+
+def fit(out, size):
+   del out[size:]
+   out.extend(bytes(size - len(out)))
+   return bytes(out)
+
+def denseCode(size = 0x10000, seed = 8085):
+   # straight line code, every byte decodes and nothing branches
+   rnd = random.Random(seed)
+   out = bytearray()
+   while len(out) < size:
+      emit(out, rnd, rnd.choice(straightLine))
+   return fit(out, size), {}
+
+def branchHeavy(size = 0x10000, seed = 8085, ratio = 0.3):
+   # short blocks ending in jumps, calls and returns to other instruction starts
+   rnd = random.Random(seed)
+   out = bytearray()
+   starts = []
+   fixups = []
+   while len(out) < size:
+      starts.append(len(out))
+      r = rnd.random()
+      if r < ratio:
+         fixups.append(len(out))
+         emit(out, rnd, rnd.choice(branches), 0)
+      elif r < ratio + 0.03:
+         emit(out, rnd, rnd.choice(returns))
+      else:
+         emit(out, rnd, rnd.choice(straightLine))
+
+   starts = [s for s in starts if s < size]
+   for at in fixups:
+      if at + 2 < size:
+         target = rnd.choice(starts)
+         out[at + 1] = target & 0xff
+         out[at + 2] = (target >> 8) & 0xff
+   return fit(out, size), {'entries' : [f"${s:04x}" for s in rnd.sample(starts, min(16, len(starts)))]}
+
+def dataHeavy(size = 0x10000, seed = 8085, dataRatio = 0.7):
+   # alternating code and random tables, the tables are declared not_code
+   rnd = random.Random(seed)
+   out = bytearray()
+   notCode = {}
+   while len(out) < size:
+      if rnd.random() < dataRatio:
+         start = len(out)
+         out.extend(rnd.randrange(256) for i in range(rnd.randrange(16, 256)))
+         notCode[f"table_{start:04x}"] = [f"${start:04x}", f"${min(len(out), size) - 1:04x}"]
+      else:
+         end = len(out) + rnd.randrange(16, 128)
+         while len(out) < end:
+            emit(out, rnd, rnd.choice(straightLine))
+   return fit(out, size), {'not_code' : notCode}
+
+def manyRanges(size = 0x10000, seed = 8085, count = 4000):
+   # dense code riddled with thousands of small not_code ranges
+   image, symbols = denseCode(size, seed)
+   rnd = random.Random(seed)
+   notCode = {}
+   for i in range(count):
+      start = rnd.randrange(size - 16)
+      notCode[f"r{i}"] = [f"${start:04x}", f"${start + rnd.randrange(16):04x}"]
+   return image, {'not_code' : notCode}
+
+def annotated(size = 0x10000, seed = 8085, count = 2000):
+   # branchy code with a large symbol file: addresses, labels, ports and notes
+   image, symbols = branchHeavy(size, seed)
+   rnd = random.Random(seed)
+   symbols['addresses'] = {f"VAR_{i}" : f"${rnd.randrange(0x10000):04x}" for i in range(count)}
+   symbols['labels'] = {f"SUB_{i}" : f"${rnd.randrange(size):04x}" for i in range(count)}
+   symbols['inPorts'] = {f"IN_{i}" : f"${i:02x}" for i in range(16)}
+   symbols['outPorts'] = {f"OUT_{i}" : f"${i:02x}" for i in range(16)}
+   symbols['notes'] = {f"${rnd.randrange(size):04x}" : f"note {i}" for i in range(count // 4)}
+   return image, symbols
+
+def banks(count = 4, size = 0x4000, seed = 8085):
+   # a multi bank set, one (image, symbols) pair per bank
+   return [branchHeavy(size, seed + i) for i in range(count)]
+
+generators = {
+   'dense' : denseCode,
+   'branchy' : branchHeavy,
+   'data' : dataHeavy,
+   'ranges' : manyRanges,
+   'annotated' : annotated,
+}
@@ -1,20 +1,26 @@
 import re
+import mmap
+
+# every literal form in one pass: 0x12 / #12 / $12 / 12h hex, 0b101 / %101 / 101b
+# binary and plain decimal. the group that matched picks the base.
+literal = re.compile(r'(?:0[xX]|[#$])([0-9a-fA-F]+)|([0-9a-fA-F]+)[hH]|(?:0[bB]|%)([01]+)|([01]+)[bB]|([0-9]+)')
+literalBase = (None, 16, 16, 2, 2, 10)
 
 def hexParse(word):
-   # tolerate hex format 0x12 or 0X34
-   if re.match(r'^(0X|0x)[0-9a-fA-F]+$', word):
-      return int(word, 16)
-   # tolerate hex format #12
-   elif re.match(r'^(#)[0-9a-fA-F]+$', word):
-      word = re.sub(r'(#)', '', word)
-      return int(f"0x{word}", 16)
-   # tolerate hex format $12
-   elif re.match(r'^(\$)[0-9a-fA-F]+$', word):
-      word = re.sub(r'(\$)', '', word)
-      return int(f"0x{word}", 16)
-   # tolerate hex format 12h
-   elif(re.match(r'^([0-9a-fA-F]+(H|h))$', word)):
-      word = re.sub(r'(H|h)', '', word)
-      return int(f"0x{word}", 16)
+   # yaml already turns unquoted 0x12 and 18 into ints
+   if isinstance(word, int):
+      return word
+   m = literal.fullmatch(word) if isinstance(word, str) else None
+   if m is None:
+      raise ValueError(f"not a number: {word!r}")
+   group = m.lastindex
+   return int(m.group(group), literalBase[group])
 
-   return None
+def loadImage(path):
+   # map the whole ROM once and index it directly instead of read(1) per byte
+   with open(path, mode='rb') as file:
+      try:
+         return memoryview(mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+      except ValueError:
+         # zero length files can't be mapped
+         return memoryview(b'')
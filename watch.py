@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+from utils import hexParse, loadImage
+from incremental import IncrementalDisassembler
+from decode import warmBackend
+import symfile
+
+def mtime(path):
+   try:
+      return os.stat(path).st_mtime_ns
+   except OSError:
+      return None
+
+def readSymbols(symPath):
+   if not os.path.isfile(symPath):
+      return None
+   return symfile.readSymbols(symPath)
+
+def report(timings, stats = None):
+   line = "rebuilt: " + ", ".join(f"{name} {seconds*1000:.1f}ms" for name, seconds in timings)
+   if stats:
+      line = line + f" ({stats['mode']}, {stats['lines']} lines)"
+   print(line, file=sys.stderr, flush=True)
+
+# keeps the program resident and rewrites output whenever the .bin or .yml
+# changes. polls mtimes, and waits for them to settle so a burst of editor
+# saves is one rebuild. options the incremental path can't patch (resolve,
+# cycles, emulate, exports, the cache) come in as rebuild, a whole run that
+# writes output itself.
+def watch(inputPath, output, addresses = False, binaryops = False, flow = False, entry = (), interval = 0.2, debounce = 0.3, rebuild = None):
+   symPath = f"{inputPath}.yml"
+   entries = [hexParse(e) for e in entry]
+   warmBackend()
+   inc = None
+   written = None
+   seen = (None, None)
+
+   while True:
+      current = (mtime(inputPath), mtime(symPath))
+      if current == seen:
+         time.sleep(interval)
+         continue
+
+      # debounce: wait until nothing has changed for a full quiet period
+      settled = current
+      while True:
+         time.sleep(debounce)
+         again = (mtime(inputPath), mtime(symPath))
+         if again == settled:
+            break
+         settled = again
+
+      timings = []
+      stats = None
+      try:
+         if rebuild is not None:
+            start = time.perf_counter()
+            session, image, program = rebuild()
+            timings.append(("rebuild", time.perf_counter() - start))
+            report(timings, {'mode' : 'full', 'lines' : len(program) if program is not None else 0})
+            seen = settled
+            continue
+
+         start = time.perf_counter()
+         symbols = readSymbols(symPath)
+         timings.append(("symbols", time.perf_counter() - start))
+
+         start = time.perf_counter()
+         if inc is None or settled[0] != seen[0]:
+            inc = IncrementalDisassembler(loadImage(inputPath), symbols, addresses, binaryops, flow, entries)
+            stats = {'mode' : 'full', 'lines' : len(inc.program)}
+         else:
+            stats = inc.update(symbols)
+         timings.append(("decode", time.perf_counter() - start))
+
+         start = time.perf_counter()
+         text = inc.text()
+         timings.append(("render", time.perf_counter() - start))
+
+         start = time.perf_counter()
+         if text != written:
+            with open(output, 'w') as file:
+               file.write(text)
+            written = text
+         timings.append(("write", time.perf_counter() - start))
+         report(timings, stats)
+      except Exception as e:
+         # keep watching, the next save will probably fix it
+         print(f"error: {type(e).__name__}: {e}", file=sys.stderr, flush=True)
+
+      seen = settled
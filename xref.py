@@ -0,0 +1,110 @@
+from instructions import *
+
+# opcode -> kind of data reference made through its 16 bit operand
+dataRefs = {
+   0x3a : 'read',     # LDA
+   0x2a : 'read',     # LHLD
+   0x32 : 'write',    # STA
+   0x22 : 'write',    # SHLD
+   0x01 : 'pointer',  # LXI B
+   0x11 : 'pointer',  # LXI D
+   0x21 : 'pointer',  # LXI H
+   0x31 : 'pointer',  # LXI SP
+}
+
+# callers / callees / readers / writers / pointers keyed by plain int address,
+# filled in by the label pass so every query is a dict lookup
+class XrefIndex:
+   def __init__(self, session):
+      self.session = session
+      self.callers = {}
+      self.callees = {}
+      self.readers = {}
+      self.writers = {}
+      self.pointers = {}
+      self.kinds = {}
+
+   def add(self, PC, line, remove = False):
+      if line.insType == InstrType.JUNK:
+         return
+
+      if line.insType == InstrType.BRANCH and line.operandType == OperandType.ADDRESS:
+         target = line.targetAddress
+         kind = 'call' if line.branchType == BranchType.CALL else 'jump'
+         self.link(self.callers, target, PC, remove)
+         self.link(self.callees, PC, target, remove)
+         self.setKind(PC, target, kind, remove)
+         return
+
+      kind = dataRefs.get(line.opcode)
+      if kind is None:
+         return
+      target = line.operand1 + (line.operand2 << 8)
+      # LXI loads constants too, only count it when it names a known symbol
+      if kind == 'pointer' and target not in self.session.syms:
+         return
+      table = {'read' : self.readers, 'write' : self.writers, 'pointer' : self.pointers}[kind]
+      self.link(table, target, PC, remove)
+      self.setKind(PC, target, kind, remove)
+
+   def addIndirect(self, PC, target, kind):
+      # RST / PCHL targets found by resolve.py, kind is 'call' or 'jump'
+      self.link(self.callers, target, PC, False)
+      self.link(self.callees, PC, target, False)
+      self.setKind(PC, target, kind, False)
+
+   def setKind(self, PC, target, kind, remove):
+      if remove:
+         self.kinds.pop((PC, target), None)
+      else:
+         self.kinds[(PC, target)] = kind
+
+   def link(self, table, key, value, remove):
+      if remove:
+         table.get(key, set()).discard(value)
+      else:
+         table.setdefault(key, set()).add(value)
+
+   def address(self, nameOrAddress):
+      # accepts an int, a symbol or label name from the .yml, or a hex literal,
+      # KeyError for anything else
+      return self.session.lookup(nameOrAddress)
+
+   def callersOf(self, address):
+      return sorted(self.callers.get(self.address(address), ()))
+
+   def calleesOf(self, address):
+      return sorted(self.callees.get(self.address(address), ()))
+
+   def readersOf(self, address):
+      return sorted(self.readers.get(self.address(address), ()))
+
+   def writersOf(self, address):
+      return sorted(self.writers.get(self.address(address), ()))
+
+   def pointersTo(self, address):
+      return sorted(self.pointers.get(self.address(address), ()))
+
+   def rows(self):
+      session = self.session
+      for (source, target), kind in sorted(self.kinds.items()):
+         name = session.syms.get(target) or session.labelNames.get(target) or ""
+         yield {'from' : source, 'to' : target, 'kind' : kind, 'name' : name}
+
+   def toJSON(self, file):
+      import json
+      json.dump({'refs' : [dict(row, **{'from' : f"${rawAddr(row['from'])}", 'to' : f"${rawAddr(row['to'])}"}) for row in self.rows()]}, file, indent=1)
+
+   def toCSV(self, file):
+      import csv
+      writer = csv.writer(file)
+      writer.writerow(('from', 'to', 'kind', 'name'))
+      for row in self.rows():
+         writer.writerow((f"${rawAddr(row['from'])}", f"${rawAddr(row['to'])}", row['kind'], row['name']))
+
+   def export(self, path):
+      with open(path, 'w', newline='') as file:
+         if str(path).endswith('.csv'):
+            self.toCSV(file)
+         else:
+            self.toJSON(file)